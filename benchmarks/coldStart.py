@@ -0,0 +1,66 @@
+"""
+Measures cold start of the CLI backtest path in fresh interpreters and checks that no heavy library is loaded.
+
+Run from the project root:
+
+    python -m benchmarks.coldStart
+    python -m benchmarks.coldStart --command evaluate --synthetic 5000 --budget 0.3
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+
+# Libraries the backtest path must not import
+heavyModules = ["yfinance", "sklearn", "imblearn", "matplotlib", "seaborn"]
+
+
+def bestRunTime(code, runs):
+    """
+    Best wall time of running `code` in a new Python process.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI cold start.")
+    parser.add_argument("--command", default="backtest", help="CLI subcommand to time.")
+    parser.add_argument("--synthetic", type=int, default=2000, help="Synthetic bars to run on (keeps the run offline).")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement (best is kept).")
+    parser.add_argument("--budget", type=float, default=0.3, help="Allowed seconds on top of starting Python with NumPy and pandas.")
+    args = parser.parse_args()
+
+    cliArgs = [args.command, "--synthetic", str(args.synthetic)]
+    cliCode = f"import cli; cli.main({cliArgs!r})"
+
+    # NumPy + pandas startup is paid by any run that touches a DataFrame, so it is measured separately
+    floor = bestRunTime("import numpy, pandas", args.runs)
+    total = bestRunTime(cliCode, args.runs)
+    overhead = total - floor
+
+    loaded = subprocess.run(
+        [sys.executable, "-c", f"{cliCode}; import sys; print('Loaded:' + ','.join(m for m in {heavyModules!r} if m in sys.modules))"],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip().splitlines()[-1].removeprefix("Loaded:")
+
+    print(f"python cli.py {' '.join(cliArgs)}")
+    print(f"  Cold start:            {total * 1000:8.1f} ms")
+    print(f"  NumPy + pandas import: {floor * 1000:8.1f} ms")
+    print(f"  Project code:          {overhead * 1000:8.1f} ms (budget {args.budget * 1000:.0f} ms)")
+    print(f"  Heavy modules loaded:  {loaded or 'none'}")
+
+    if loaded or overhead > args.budget:
+        print("Cold start check failed.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Replays the streaming engine and the parameter sweep against the DataFrame functions and exits with code 1 on any mismatch.
+
+Run from the project root:
+
+    python -m benchmarks.replayChecks
+    python -m benchmarks.replayChecks --bars 20000 --seeds 1 2 3
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.syntheticData import generateSyntheticPrices
+from src.movingAverageStrategy import applyMAStrategy
+from src.backtestStrategy import backtestMAStrategy
+from src.backtestWithRisk import backtestWithRiskControl
+from src.parameterSweep import sweepMAStrategy
+from src.streamingStrategy import StreamingMAStrategy
+
+
+def checkData(numBars, seed):
+    """
+    Synthetic prices with a flat stretch in the middle, where equal moving averages test the tie handling.
+    """
+    data = generateSyntheticPrices(numBars, seed=seed)[["Close"]]
+    middle = numBars // 2
+    data.iloc[middle:middle + 400, 0] = data["Close"].iloc[middle]
+    return data
+
+
+def replayStreaming(data, shortWindow=10, longWindow=50, initialCapital=10000, stopLoss=0.1, takeProfit=0.2):
+    """
+    Replays a price history through StreamingMAStrategy one bar at a time and compares
+    every bar with applyMAStrategy + backtestWithRiskControl.
+
+    Returns:
+        pd.DataFrame: Batch and streaming values for every bar where they differ (empty if they match bar for bar).
+    """
+    batch = applyMAStrategy(data[["Close"]].copy(), shortWindow, longWindow)
+    batch = backtestWithRiskControl(batch, initialCapital, stopLoss, takeProfit)
+
+    # backtestWithRiskControl fills the first row's missing Position with 0, so compare against the raw signal columns
+    batch["Position"] = batch["Signal"].diff()
+
+    engine = StreamingMAStrategy(shortWindow, longWindow, initialCapital, stopLoss, takeProfit)
+    streamed = pd.DataFrame(engine.updateMany(data["Close"]), index=data.index)
+
+    columns = ["ShortMA", "LongMA", "Signal", "Position", "Holdings", "Cash", "Total", "Trade"]
+    expected = batch[columns].astype(float)
+    actual = streamed[columns].astype(float)
+
+    # Equal, or both missing
+    differs = (expected != actual) & ~(expected.isna() & actual.isna())
+    return pd.concat({"Batch": expected, "Streaming": actual}, axis=1)[differs.any(axis=1)]
+
+
+def replaySweep(data, shortWindows, longWindows, initialCapital=10000, stopLoss=None, takeProfit=None):
+    """
+    Runs every window pair through sweepMAStrategy and through applyMAStrategy + backtestMAStrategy
+    (or backtestWithRiskControl when stopLoss / takeProfit are given) and compares Position and Trade bar by bar.
+
+    Returns:
+        pd.DataFrame: Window pairs whose bars differ, with the number of differing bars (empty if every pair matches).
+    """
+    sweep = sweepMAStrategy(data, shortWindows, longWindows, initialCapital, stopLoss, takeProfit,
+                            keepResults=True, equityDtype=np.float64)
+
+    rows = []
+    for result in sweep["Result"]:
+        shortWindow, longWindow = result.params["ShortWindow"], result.params["LongWindow"]
+        batch = applyMAStrategy(data[["Close"]].copy(), shortWindow, longWindow)
+        if result.stopLoss is None and result.takeProfit is None:
+            batch = backtestMAStrategy(batch, initialCapital)
+        else:
+            batch = backtestWithRiskControl(batch, initialCapital, result.stopLoss, result.takeProfit)
+
+        rows.append({
+            "ShortWindow": shortWindow, "LongWindow": longWindow,
+            "Position Mismatches": int((batch["Position"].to_numpy() != result.position).sum()),
+            "Trade Mismatches": int((batch["Trade"].to_numpy() != result.trade).sum()),
+        })
+
+    rows = pd.DataFrame(rows, columns=["ShortWindow", "LongWindow", "Position Mismatches", "Trade Mismatches"])
+    return rows[(rows["Position Mismatches"] > 0) | (rows["Trade Mismatches"] > 0)].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the streaming engine and the sweep match the DataFrame functions.")
+    parser.add_argument("--bars", type=int, default=5000, help="Bars per synthetic history.")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3], help="Seeds of the synthetic histories.")
+    args = parser.parse_args()
+
+    failures = 0
+    for seed in args.seeds:
+        data = checkData(args.bars, seed)
+        mismatches = replayStreaming(data)
+        print(f"streaming  seed {seed}: {len(mismatches)} mismatched bars")
+        if len(mismatches):
+            print(mismatches.head())
+            failures += 1
+
+        for stopLoss, takeProfit in [(None, None), (0.1, 0.2)]:
+            mismatches = replaySweep(data, [5, 10, 20], [30, 50, 100, 200], stopLoss=stopLoss, takeProfit=takeProfit)
+            print(f"sweep      seed {seed} (stop loss {stopLoss}, take profit {takeProfit}): {len(mismatches)} mismatched pairs")
+            if len(mismatches):
+                print(mismatches)
+                failures += 1
+
+    print("All replays match." if not failures else f"{failures} replay(s) differ.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Benchmarks every pipeline stage on synthetic data and flags regressions against a stored baseline.
+
+Run from the project root:
+
+    python -m benchmarks.runBenchmarks
+    python -m benchmarks.runBenchmarks --sizes 1000 100000 --stages applyMAStrategy backtestMAStrategy
+    python -m benchmarks.runBenchmarks --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.syntheticData import generateSyntheticPrices
+from src.movingAverageStrategy import applyMAStrategy
+from src.backtestStrategy import backtestMAStrategy
+from src.backtestWithRisk import backtestWithRiskControl
+from src.evaluatePerformance import evaluatePerformance
+from src.createMLDataset import createMLDataset
+from src.trainMLModel import trainAndEvaluateModel
+
+
+defaultSizes = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# Stage name -> (setup(data) returning the stage's input, stage(input), largest size run by default)
+# Setup runs outside the timer, so only the stage itself is measured
+stages = {
+    "applyMAStrategy": (lambda data: data.copy(), applyMAStrategy, 10_000_000),
+    "backtestMAStrategy": (lambda data: applyMAStrategy(data.copy()), backtestMAStrategy, 10_000_000),
+    "backtestWithRiskControl": (lambda data: applyMAStrategy(data.copy()), backtestWithRiskControl, 1_000_000),
+    "evaluatePerformance": (lambda data: backtestWithRiskControl(applyMAStrategy(data.copy())), evaluatePerformance, 1_000_000),
+    "createMLDataset": (lambda data: applyMAStrategy(data.copy()), createMLDataset, 1_000_000),
+    "trainAndEvaluateModel": (lambda data: createMLDataset(applyMAStrategy(data.copy())), lambda dataset: trainAndEvaluateModel(*dataset), 100_000),
+}
+
+
+def measure(stage, stageInput, repeats):
+    """
+    Runs a stage `repeats` times and returns the best wall time and the peak traced memory.
+    """
+    bestTime = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stage(stageInput)
+        bestTime = min(bestTime, time.perf_counter() - start)
+
+    # Memory is traced in a separate run so the tracing overhead doesn't affect the timings
+    tracemalloc.start()
+    stage(stageInput)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return bestTime, peak / 1024 ** 2
+
+
+def runBenchmarks(sizes, stageNames, repeats=3, maxSize=None, seed=42):
+    """
+    Times every selected stage at every size.
+
+    Returns:
+        list: One dict per (stage, size) with 'seconds' and 'peakMemoryMB'.
+    """
+    results = []
+    for size in sizes:
+        data = generateSyntheticPrices(size, seed=seed)
+        for name in stageNames:
+            setup, stage, stageMaxSize = stages[name]
+            if size > (maxSize or stageMaxSize):
+                continue
+
+            stageInput = setup(data)
+            seconds, peakMemory = measure(stage, stageInput, repeats)
+            results.append({"stage": name, "size": size, "seconds": seconds, "peakMemoryMB": peakMemory})
+            print(f"{name:<25} {size:>11,} bars  {seconds:10.4f} s  {peakMemory:10.1f} MB")
+
+    return results
+
+
+def findRegressions(results, baseline, tolerance, minSeconds=0.01):
+    """
+    Compares results with a baseline run.
+
+    Returns:
+        list: Messages for every (stage, size) whose time or peak memory grew by more than `tolerance` (e.g. 0.2 = 20%).
+        Timings under `minSeconds` in both runs are too noisy to compare and are skipped.
+    """
+    previous = {(entry["stage"], entry["size"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry["stage"], entry["size"]))
+        if old is None:
+            continue
+        for key, label in [("seconds", "time"), ("peakMemoryMB", "peak memory")]:
+            if key == "seconds" and max(old[key], entry[key]) < minSeconds:
+                continue
+            if old[key] > 0 and entry[key] > old[key] * (1 + tolerance):
+                regressions.append(
+                    f"{entry['stage']} @ {entry['size']:,} bars: {label} {old[key]:.4g} -> {entry[key]:.4g} "
+                    f"(+{(entry[key] / old[key] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the MA crossover pipeline on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=defaultSizes, help="Number of bars to test.")
+    parser.add_argument("--stages", nargs="+", default=list(stages), choices=list(stages), help="Stages to time.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage (best is kept).")
+    parser.add_argument("--max-size", type=int, default=None, help="Run every stage up to this size (overrides each stage's default limit).")
+    parser.add_argument("--output", default="benchmarks/results/latest.json", help="Where to write the results.")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json", help="Baseline results to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging a regression (0.2 = 20%%).")
+    parser.add_argument("--min-seconds", type=float, default=0.01, help="Ignore time changes when both runs are faster than this.")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the new baseline.")
+    args = parser.parse_args()
+
+    results = runBenchmarks(args.sizes, args.stages, args.repeats, args.max_size)
+    report = {
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.platform(),
+        "results": results,
+    }
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to: {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = findRegressions(results, json.load(f), args.tolerance, args.min_seconds)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("No regressions against baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
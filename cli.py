@@ -0,0 +1,183 @@
+"""
+Command-line entry point for the MA crossover project.
+
+    python cli.py download BTC-USD --start 2018-01-01 --end 2025-04-01
+    python cli.py signals BTC-USD --short 10 --long 50
+    python cli.py backtest BTC-USD --stop-loss 0.1 --take-profit 0.2
+    python cli.py sweep BTC-USD --short 5 10 20 --long 50 100 200
+    python cli.py evaluate BTC-USD
+    python cli.py train BTC-USD --save-model models/btc
+    python cli.py plot BTC-USD
+
+Every subcommand imports only the modules it needs: the backtest path never loads
+yfinance (when the data is already stored), scikit-learn, imbalanced-learn or matplotlib.
+Pass --synthetic BARS to any subcommand to run on generated prices instead of downloaded ones.
+"""
+
+import argparse
+import sys
+
+
+def loadData(args):
+    if args.synthetic:
+        from src.syntheticData import generateSyntheticPrices
+        return generateSyntheticPrices(args.synthetic, seed=args.seed)
+
+    from src.dataLoader import downloadPriceData
+    return downloadPriceData(args.symbol, start=args.start, end=args.end, saveTo=args.data_dir)
+
+
+def runBacktest(args):
+    from src.pipeline import signalsStage, backtestStage
+
+    signals = signalsStage(loadData(args), args.short, args.long)
+    return backtestStage(signals, args.capital, args.stop_loss, args.take_profit)
+
+
+def printTable(df, output=None):
+    if output:
+        df.to_csv(output)
+        print(f"Saved to: {output}")
+    else:
+        print(df.to_string())
+
+
+def downloadCommand(args):
+    data = loadData(args)
+    print(f"{args.symbol}: {len(data)} bars from {data.index[0]} to {data.index[-1]}")
+
+
+def signalsCommand(args):
+    from src.pipeline import signalsStage
+
+    signals = signalsStage(loadData(args), args.short, args.long)
+    printTable(signals[["Close", "ShortMA", "LongMA", "Signal", "Position"]].tail(args.tail), args.output)
+
+
+def backtestCommand(args):
+    backtested = runBacktest(args)
+    trades = backtested[backtested["Trade"] != 0]
+    print(f"Final portfolio value: {backtested['Total'].iloc[-1]:.2f} ({len(trades)} trades)")
+    printTable(backtested[["Close", "Position", "Holdings", "Cash", "Total", "Trade"]].tail(args.tail), args.output)
+
+
+def evaluateCommand(args):
+    from src.evaluatePerformance import evaluatePerformance
+
+    performance = evaluatePerformance(runBacktest(args), args.capital)
+    print("\nStrategy Performance Summary:")
+    for key, value in performance.items():
+        print(f"{key}: {value}")
+
+
+def sweepCommand(args):
+    from src.parameterSweep import sweepMAStrategy
+
+    results = sweepMAStrategy(
+        loadData(args), args.short, args.long, args.capital,
+        stopLoss=args.stop_loss, takeProfit=args.take_profit, rankBy=args.rank_by,
+    )
+    printTable(results.head(args.top), args.output)
+
+
+def trainCommand(args):
+    from src.pipeline import signalsStage
+    from src.createMLDataset import createMLDataset
+    from src.trainMLModel import trainAndEvaluateModel
+
+    X_train, X_test, y_train, y_test = createMLDataset(signalsStage(loadData(args)), lookahead=args.lookahead)
+    model, mlMetrics, mlPredictions = trainAndEvaluateModel(X_train, X_test, y_train, y_test)
+
+    print(f"\nML Model Performance ({args.lookahead}-day Lookahead):")
+    for key, value in mlMetrics.items():
+        print(f"{key}: {value}")
+
+    if args.save_model:
+        from src.modelArtifacts import saveModelArtifact
+        saveModelArtifact(model, args.save_model, lookahead=args.lookahead)
+        print(f"Model saved to: {args.save_model}")
+
+    if args.confusion_matrix:
+        from src.trainMLModel import plotConfusionMatrix
+        plotConfusionMatrix(y_test, mlPredictions, saveTo=args.images_dir)
+
+
+def plotCommand(args):
+    from src.plotSignals import plotSignals
+    from src.plotBacktest import plotBacktestStrategy
+
+    backtested = runBacktest(args)
+    plotSignals(backtested, symbol=args.symbol, saveTo=args.images_dir, maxPoints=args.max_points, method=args.method)
+    plotBacktestStrategy(backtested, saveTo=args.images_dir, maxPoints=args.max_points, method=args.method)
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(description="Moving average crossover strategy tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Options every subcommand shares
+    dataOptions = argparse.ArgumentParser(add_help=False)
+    dataOptions.add_argument("symbol", nargs="?", default="BTC-USD", help="Ticker symbol (default: BTC-USD).")
+    dataOptions.add_argument("--start", default="2018-01-01", help="Start date (YYYY-MM-DD).")
+    dataOptions.add_argument("--end", default="2025-04-01", help="End date (YYYY-MM-DD, exclusive).")
+    dataOptions.add_argument("--data-dir", default="data/", help="Local price store folder.")
+    dataOptions.add_argument("--synthetic", type=int, metavar="BARS", help="Use this many synthetic bars instead of downloading.")
+    dataOptions.add_argument("--seed", type=int, default=42, help="Seed for --synthetic data.")
+
+    strategyOptions = argparse.ArgumentParser(add_help=False)
+    strategyOptions.add_argument("--short", type=int, default=10, help="Short moving average window.")
+    strategyOptions.add_argument("--long", type=int, default=50, help="Long moving average window.")
+
+    backtestOptions = argparse.ArgumentParser(add_help=False)
+    backtestOptions.add_argument("--capital", type=float, default=10000, help="Initial capital.")
+    backtestOptions.add_argument("--stop-loss", type=float, help="Stop loss, e.g. 0.1 = 10%% (omit both for the plain backtest).")
+    backtestOptions.add_argument("--take-profit", type=float, help="Take profit, e.g. 0.2 = 20%%.")
+
+    outputOptions = argparse.ArgumentParser(add_help=False)
+    outputOptions.add_argument("--tail", type=int, default=10, help="Number of final rows to print.")
+    outputOptions.add_argument("--output", help="Save the table to this CSV file instead of printing it.")
+
+    command = commands.add_parser("download", parents=[dataOptions], help="Download or update the local price store.")
+    command.set_defaults(run=downloadCommand)
+
+    command = commands.add_parser("signals", parents=[dataOptions, strategyOptions, outputOptions], help="Compute crossover signals.")
+    command.set_defaults(run=signalsCommand)
+
+    command = commands.add_parser("backtest", parents=[dataOptions, strategyOptions, backtestOptions, outputOptions], help="Backtest the strategy.")
+    command.set_defaults(run=backtestCommand)
+
+    command = commands.add_parser("evaluate", parents=[dataOptions, strategyOptions, backtestOptions], help="Backtest and print performance metrics.")
+    command.set_defaults(run=evaluateCommand)
+
+    command = commands.add_parser("sweep", parents=[dataOptions, backtestOptions], help="Backtest many window pairs at once.")
+    command.add_argument("--short", type=int, nargs="+", default=[5, 10, 20], help="Short windows to try.")
+    command.add_argument("--long", type=int, nargs="+", default=[50, 100, 200], help="Long windows to try.")
+    command.add_argument("--rank-by", default="Closed Trade Return (%)", help="Metric used to rank pairs.")
+    command.add_argument("--top", type=int, default=10, help="Number of pairs to show.")
+    command.add_argument("--output", help="Save the table to this CSV file instead of printing it.")
+    command.set_defaults(run=sweepCommand)
+
+    command = commands.add_parser("train", parents=[dataOptions], help="Train and evaluate the ML model.")
+    command.add_argument("--lookahead", type=int, default=3, help="Days ahead the label looks.")
+    command.add_argument("--save-model", metavar="PATH", help="Save the trained model as an artifact folder.")
+    command.add_argument("--confusion-matrix", action="store_true", help="Save the confusion matrix plot.")
+    command.add_argument("--images-dir", default="images/", help="Folder for saved plots.")
+    command.set_defaults(run=trainCommand)
+
+    command = commands.add_parser("plot", parents=[dataOptions, strategyOptions, backtestOptions], help="Save signal and backtest plots.")
+    command.add_argument("--images-dir", default="images/", help="Folder for saved plots.")
+    command.add_argument("--max-points", type=int, default=5000, help="Downsample lines longer than this (0 = plot every point).")
+    command.add_argument("--method", choices=["minmax", "lttb"], default="minmax", help="Downsampling method.")
+    command.set_defaults(run=plotCommand)
+
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    args.run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,22 @@
-from src.dataLoader import downloadPriceData
-from src.movingAverageStrategy import applyMAStrategy
-from src.plotSignals import plotSignals
-from src.backtestStrategy import backtestMAStrategy
-from src.plotBacktest import plotBacktestStrategy
-from src.evaluatePerformance import evaluatePerformance
-from src.backtestWithRisk import backtestWithRiskControl
-from src.createMLDataset import createMLDataset
-from src.trainMLModel import trainAndEvaluateModel, plotConfusionMatrix
+from src.pipeline import buildStrategyPipeline
 
 
+# Every stage is cached under cache/pipeline/: rerunning with the same settings only redraws the plots,
+# and changing e.g. stopLoss only reruns the backtest and the stages after it
+pipeline = buildStrategyPipeline("BTC-USD", start="2018-01-01", end="2025-04-01", stopLoss=0.5, takeProfit=0.01)
+results = pipeline.run()
 
-
-dataFrame = downloadPriceData("BTC-USD", start="2018-01-01", end="2025-04-01")
-
-dataWithSignals = applyMAStrategy(dataFrame)
-
-plotSignals(dataWithSignals)
-# print(dataWithSignals[["Close", "ShortMA", "LongMA", "Signal", "Position"]].tail(10))
-
-# backtestedData = backtestMAStrategy(dataWithSignals)
-backtestedData = backtestWithRiskControl(dataWithSignals, stopLoss=0.5, takeProfit=0.01)
-plotBacktestStrategy(backtestedData)
-
-# print(backtestedData[["Close", "ShortMA", "LongMA", "Signal", "Position", "Holdings", "Cash", "Total", "Trade"]].tail(20))
-
-# trades = backtestedData[backtestedData["Trade"] != 0].copy()
-# print(trades)
+# print(results["signals"][["Close", "ShortMA", "LongMA", "Signal", "Position"]].tail(10))
+# print(results["backtest"][["Close", "ShortMA", "LongMA", "Signal", "Position", "Holdings", "Cash", "Total", "Trade"]].tail(20))
 
 # Results
-performance = evaluatePerformance(backtestedData)
+performance = results["performance"]
 print("\nStrategy Performance Summary:")
 for key, value in performance.items():
     print(f"{key}: {value}")
 
 
-# Prepare ML dataset
-X_train, X_test, y_train, y_test = createMLDataset(dataWithSignals)
-
-# Train and evaluate model
-model, mlMetrics, mlPredictions = trainAndEvaluateModel(X_train, X_test, y_train, y_test)
-plotConfusionMatrix(y_test, mlPredictions)
-
+model, mlMetrics, mlPredictions = results["model"]
 
 # Results
 print("\nML Model Performance (3-day Lookahead):")
@@ -48,4 +24,6 @@ for key, value in mlMetrics.items():
     print(f"{key}: {value}")
 
 
-
+# Time, peak memory and cache hit/miss per stage
+print("\nPipeline Profile:")
+print(pipeline.report.drop(columns="Key").to_string())
@@ -0,0 +1,39 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def useAggBackend():
+    """
+    Worker initializer: switch matplotlib to the non-interactive Agg backend (no windows, no GUI event loop).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def renderPlot(plotFunction, data, kwargs):
+    return plotFunction(data, **kwargs)
+
+
+def renderPlotsInBackground(jobs, workers=None):
+    """
+    Renders charts in background worker processes so plotting doesn't block the caller.
+
+    Args:
+        jobs (list): (plotFunction, data, kwargs) tuples, e.g. (plotSignals, signals, {"symbol": "ETH-USD"}).
+            plotFunction must be a module-level function such as plotSignals or plotBacktestStrategy.
+            Only pass the columns the chart needs: data is pickled to the worker.
+        workers (int): Number of worker processes (defaults to the CPU count, at most one per job).
+
+    Returns:
+        list: One Future per job. future.result() waits for the chart and returns its image path.
+    """
+    if not jobs:
+        return []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=useAggBackend)
+    futures = [executor.submit(renderPlot, plotFunction, data, kwargs or {}) for plotFunction, data, kwargs in jobs]
+
+    # Queued jobs keep running; the workers exit once the last chart is saved
+    executor.shutdown(wait=False)
+    return futures
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from src.movingAverageStrategy import crossoverSignals
+from src.backtestStrategy import runMAStrategyEngine
+from src.backtestWithRisk import runRiskControlKernel, riskLimits
+from src.evaluatePerformance import evaluateRuns
+
+
+class BacktestResult:
+    """
+    Compact result of one backtest run.
+
+    Keeps only what a run adds, as contiguous typed arrays: int8 Position, int8 Trade and the
+    equity curve (float64, or float32 to halve it). The price index and 'Close' are references
+    to the shared price data, not copies. Holdings and Cash are not stored; to_frame() rebuilds
+    the full backtest DataFrame on demand from the prices and positions, exactly as
+    backtestMAStrategy / backtestWithRiskControl would produce it.
+    """
+
+    __slots__ = ("index", "close", "position", "total", "trade", "initialCapital", "stopLoss", "takeProfit", "params")
+
+    def __init__(self, index, close, position, total, trade, initialCapital=10000, stopLoss=None, takeProfit=None,
+                 params=None, equityDtype=np.float64):
+        """
+        Args:
+            index (pd.Index): Shared bar index of the price data.
+            close (np.ndarray): Shared closing prices (kept as a reference).
+            position (np.ndarray): 'Position' values of this run (stored as int8).
+            total (np.ndarray): Equity curve ('Total') of this run.
+            trade (np.ndarray): Trade flags (stored as int8).
+            initialCapital (float): Starting cash of the run.
+            stopLoss (float): Stop loss of a risk-controlled run (None for the plain crossover backtest).
+            takeProfit (float): Take profit of a risk-controlled run.
+            params (dict): Optional labels for the run (e.g. the window pair).
+            equityDtype (np.dtype): np.float64, or np.float32 for a smaller (approximate) stored equity curve.
+        """
+        self.index = index
+        self.close = close
+        self.position = np.ascontiguousarray(np.nan_to_num(position), dtype=np.int8)
+        self.total = np.ascontiguousarray(total, dtype=equityDtype)
+        self.trade = np.ascontiguousarray(trade, dtype=np.int8)
+        self.initialCapital = initialCapital
+        self.stopLoss = stopLoss
+        self.takeProfit = takeProfit
+        self.params = params or {}
+
+    @property
+    def nbytes(self):
+        """
+        Bytes of array data owned by this result (the shared index and prices are not counted).
+        """
+        return self.position.nbytes + self.total.nbytes + self.trade.nbytes
+
+    @property
+    def finalValue(self):
+        return float(self.total[-1])
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Builds the backtest DataFrame ('Close', 'Position', 'Holdings', 'Cash', 'Total', 'Trade') for plotting or evaluatePerformance.
+
+        The engine is re-run in float64, so the values are exact even when the stored equity curve is float32.
+        """
+        close = np.asarray(self.close, dtype=np.float64)
+        position = self.position.astype(np.float64)
+
+        if self.stopLoss is None and self.takeProfit is None:
+            holdings, cash, total, trade = runMAStrategyEngine(close, position, self.initialCapital)
+        else:
+            holdings, cash, total, trade = (
+                column[:, 0] for column in runRiskControlKernel(
+                    close, position, self.stopLoss, self.takeProfit, self.initialCapital, components=True
+                )
+            )
+
+        return pd.DataFrame({
+            "Close": close,
+            "Position": position,
+            "Holdings": holdings,
+            "Cash": cash,
+            "Total": total,
+            "Trade": trade.astype(np.float64),
+        }, index=self.index)
+
+    def metrics(self, periodsPerYear=365) -> dict:
+        """
+        evaluatePerformance metrics computed straight from the stored arrays (no DataFrame is built).
+        """
+        results = evaluateRuns(self.close, self.trade[:, None], self.initialCapital, periodsPerYear).to_dict("records")[0]
+        if np.isnan(results["Win Rate (%)"]):
+            results["Win Rate (%)"] = "N/A"
+        return results
+
+
+def compactBacktest(data, shortWindow=10, longWindow=50, initialCapital=10000, stopLoss=None, takeProfit=None,
+                    equityDtype=np.float64) -> BacktestResult:
+    """
+    Runs the MA crossover backtest without widening or copying the price DataFrame.
+
+    Gives the same Position, Total and Trade values as applyMAStrategy followed by backtestMAStrategy
+    (or backtestWithRiskControl when stopLoss / takeProfit are given). The input is not modified.
+
+    Args:
+        data (pd.DataFrame): Price data with a 'Close' column.
+        shortWindow (int): The period for the short-term moving average.
+        longWindow (int): The period for the long-term moving average.
+        initialCapital (float): Starting cash.
+        stopLoss (float): Stop loss (e.g. 0.1 = 10%). Leave both None for the plain crossover backtest (see riskLimits).
+        takeProfit (float): Take profit (e.g. 0.2 = 20%).
+        equityDtype (np.dtype): Storage type of the equity curve (np.float32 halves it).
+
+    Returns:
+        BacktestResult: Compact result referring to data's index and 'Close' values.
+    """
+    if "Close" not in data.columns:
+        raise ValueError("DataFrame must contain a 'Close' column.")
+
+    closeSeries = data["Close"]
+    close = closeSeries.to_numpy(dtype=np.float64)
+
+    # Same rolling means as applyMAStrategy, but kept out of the DataFrame
+    shortMA = closeSeries.rolling(window=shortWindow).mean().to_numpy()
+    longMA = closeSeries.rolling(window=longWindow).mean().to_numpy()
+    _, position = crossoverSignals(shortMA, longMA)
+
+    limits = riskLimits(stopLoss, takeProfit)
+    if limits is None:
+        _, _, total, trade = runMAStrategyEngine(close, position, initialCapital)
+    else:
+        stopLoss, takeProfit = limits
+        total, trade = runRiskControlKernel(close, position, stopLoss, takeProfit, initialCapital)
+        total, trade = total[:, 0], trade[:, 0]
+
+    return BacktestResult(
+        data.index, close, position, total, trade, initialCapital, stopLoss, takeProfit,
+        params={"ShortWindow": shortWindow, "LongWindow": longWindow}, equityDtype=equityDtype,
+    )
@@ -1,5 +1,74 @@
+import numpy as np
 import pandas as pd
 
+
+def runMAStrategyEngine(close, position, initialCapital=10000):
+    """
+    Array-based engine for the long-only Moving Average Crossover backtest.
+
+    Works directly on NumPy arrays instead of walking the DataFrame row by row,
+    and produces exactly the same numbers as the original loop. Passing 2-D arrays
+    (one column per run, e.g. from a parameter sweep) backtests every column at once.
+
+    Args:
+        close (np.ndarray): Closing prices, shape (bars,) or (bars, runs).
+        position (np.ndarray): 'Position' values, shape (bars,) or (bars, runs). NaN is treated as 0.
+        initialCapital (float): Starting money for the simulation.
+
+    Returns:
+        tuple: (holdings, cash, total, trade) as float64 NumPy arrays, 1-D if both inputs are 1-D, otherwise (bars, runs).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    position = np.nan_to_num(np.asarray(position, dtype=np.float64), nan=0.0)
+    singleRun = close.ndim == 1 and position.ndim == 1
+
+    # Work in (runs, bars) form so every run is scanned through contiguous memory,
+    # sharing one price/position row between runs where only one is given
+    close = close.reshape(len(close), -1).T
+    position = position.reshape(len(position), -1).T
+    n = close.shape[1]
+    numRuns = np.broadcast_shapes(close.shape[:1], position.shape[:1])[0]
+    close = np.broadcast_to(close, (numRuns, n))
+    position = np.ascontiguousarray(np.broadcast_to(position, (numRuns, n)))
+    barIndex = np.arange(n)
+
+    # A buy is only taken when out of a trade and a sell only when in one, so after
+    # every row the state is simply "was the last non-zero Position a buy?"
+    # Forward fill the index of the last non-zero Position to get that answer for every row
+    lastEvent = np.maximum.accumulate(np.where(position != 0, barIndex, 0), axis=1)
+    inPosition = np.take_along_axis(position, lastEvent, axis=1) > 0
+
+    wasInPosition = np.empty((numRuns, n), dtype=bool)
+    wasInPosition[:, :1] = False
+    wasInPosition[:, 1:] = inPosition[:, :-1]
+
+    buy = inPosition & ~wasInPosition # Entered a trade on this row
+    sell = ~inPosition & wasInPosition # Exited a trade on this row
+    hold = inPosition & wasInPosition # Still holding from an earlier row
+
+    # Entry price of the trade that is currently open (forward filled from the last buy row)
+    lastBuy = np.maximum.accumulate(np.where(buy, barIndex, 0), axis=1)
+    entryPrice = np.take_along_axis(close, lastBuy, axis=1)
+
+    holdings = np.zeros((numRuns, n))
+    cash = np.full((numRuns, n), float(initialCapital))
+    trade = np.zeros((numRuns, n))
+
+    holdings[buy] = initialCapital # Buy full with all cash
+    cash[buy] = 0.0 # No cash left after buying
+    trade[buy] = 1
+
+    holdings[hold] = (initialCapital / entryPrice[hold]) * close[hold] # Value of the open trade at today's price
+
+    cash[sell] = (initialCapital / entryPrice[sell]) * close[sell] # Proceeds from selling go back into cash
+    trade[sell] = -1
+
+    total = cash + holdings
+    if singleRun:
+        return holdings[0], cash[0], total[0], trade[0]
+    return holdings.T, cash.T, total.T, trade.T
+
+
 def backtestMAStrategy(data, initialCapital=10000):
     """
     Simulates trades for a Moving Average Crossover strategy using 'Position' signals.
@@ -20,44 +89,15 @@ def backtestMAStrategy(data, initialCapital=10000):
     data['Signal'] = data["Signal"].fillna(0)
     data['Position'] = data['Position'].fillna(0)
 
+    # Holdings = value invested in Bitcoin, Cash = money not in a trade,
+    # Total = Cash + Holdings (account balance each day), Trade = 1 for buy, -1 for sell, 0 for no trade
+    holdings, cash, total, trade = runMAStrategyEngine(
+        data['Close'].to_numpy(), data['Position'].to_numpy(), initialCapital
+    )
+
+    data['Holdings'] = holdings
+    data['Cash'] = cash
+    data['Total'] = total
+    data['Trade'] = trade
 
-    data['Holdings'] = 0.0 # Tracks how much value you have invested in Bitcoin at any time. Starts at 0 since nothing has been bought.
-    data['Cash'] = float(initialCapital) # Tracks how much money is sitting as cash. Starts as initialCapital ($10,000) since its not in any trade yet.
-    data['Total'] = float(initialCapital) # Combines both: Cash + Holdings. This is your account balance each day.
-    data['Trade'] = 0.0 # Used to mark trades. Will mark 1 for buy, -1 for sell, 0 for no trade
-
-    # Tracks if you're currently "in a trade" (i.e., holding Bitcoin) 
-    inPosition = False # (False means: you're not currently holding any Bitcoin It becomes True once you buy in (enter a position))
-    
-    entryPrice = 0.0 # Will remember the price at which you bought
-
-    for i in range(len(data)): # Go row by row through the DataFrame (e.g. 2000 days of price history)
-        row = data.iloc[i] # Get the row at position i, row is now a single row of the table "Series". Returns the entire row, not just one value
-
-        # BUY condition
-        if row['Position'] > 0 and not inPosition: # If a buy signal is detected (Position > 0) AND you're not already in a trade (not inPosition)
-            entryPrice = row['Close'] # Remember the price at which you bought
-            data.at[data.index[i], "Holdings"] = initialCapital # Buy full with all cash
-            data.at[data.index[i], "Cash"] = 0.0 # No cash left after buying
-            data.at[data.index[i], "Trade"] = 1 # Mark this row as a buy trade
-            inPosition = True # Now you're in a trade
-
-        # SELL condition
-        elif row['Position'] < 0 and inPosition: # If a sell signal is detected (Position < 0) AND you're currently in a trade (inPosition)
-            exitPrice = row['Close'] # Remember the price at which you sold
-            qty = initialCapital / entryPrice # Calculate how much you bought (if you had $10,000 and BTC was $20,000, you bought 0.5 BTC)
-            proceeds = qty * exitPrice # Calculate how much you made from selling 
-            data.at[data.index[i], "Cash"] = proceeds # Put the money from selling back into cash (Update Cash Value)
-            data.at[data.index[i], "Holdings"] = 0 # No more holdings after selling
-            data.at[data.index[i], "Trade"] = -1 # Mark this row as a sell trade
-            inPosition = False # Now you're not in a trade anymore
-        
-        # Hold position
-        elif inPosition: # If you're in a trade but no buy/sell signal is detected
-            qty = initialCapital / entryPrice # Calculate how much you bought (if you had $10,000 and BTC was $20,000, you bought 0.5 BTC)
-            data.at[data.index[i], "Holdings"] = qty * row["Close"] # Update the value of your holdings based on the current price
-
-        # Update total
-        data.at[data.index[i], "Total"] = data.at[data.index[i], "Cash"] + data.at[data.index[i], "Holdings"] # Update the total value of your account (cash + holdings)
-
-    return data # Return the DataFrame with all the new columns added
\ No newline at end of file
+    return data # Return the DataFrame with all the new columns added
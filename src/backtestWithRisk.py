@@ -1,5 +1,143 @@
+import numpy as np
 import pandas as pd
 
+
+def runRiskControlKernel(close, position, stopLoss=0.1, takeProfit=0.2, initialCapital=10000, components=False,
+                        startState=None, returnState=False):
+    """
+    State machine kernel for the stop loss / take profit backtest, run for many settings at once.
+
+    Stop loss and take profit exits depend on the entry price, so the bars have to be walked in
+    order. Instead of re-running the whole backtest for every setting, each step of the walk
+    updates all runs together as NumPy vectors.
+
+    Args:
+        close (np.ndarray): Closing prices, shape (bars,) shared by every run or (bars, runs).
+        position (np.ndarray): 'Position' values, shape (bars,) or (bars, runs). NaN is treated as 0.
+        stopLoss (float or np.ndarray): Stop loss per run (e.g. 0.1 = 10%), scalar or shape (runs,).
+        takeProfit (float or np.ndarray): Take profit per run (e.g. 0.2 = 20%), scalar or shape (runs,).
+        initialCapital (float): Starting cash for every run.
+        components (bool): Also return the Holdings and Cash matrices.
+        startState (tuple): (inPosition, entryPrice) per run from a previous call, to continue a backtest
+            where the last block of bars ended. Defaults to starting out of a trade.
+        returnState (bool): Also return the (inPosition, entryPrice) state after the last bar.
+
+    Returns:
+        tuple: (total, trade) where total is a float64 matrix of equity curves and trade is an int8
+        matrix of trade flags (1 = buy, -1 = sell), both shaped (bars, runs).
+        With components=True: (holdings, cash, total, trade).
+        With returnState=True the state tuple is appended.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    position = np.nan_to_num(np.asarray(position, dtype=np.float64), nan=0.0)
+    stopLoss = np.atleast_1d(np.asarray(stopLoss, dtype=np.float64))
+    takeProfit = np.atleast_1d(np.asarray(takeProfit, dtype=np.float64))
+
+    numBars = len(close)
+    numRuns = np.broadcast_shapes(close.shape[1:], position.shape[1:], stopLoss.shape, takeProfit.shape)[0]
+
+    # Exit multipliers for every run (price <= entry * (1 - stopLoss), price >= entry * (1 + takeProfit))
+    stopMultiplier = np.broadcast_to(1 - stopLoss, (numRuns,))
+    profitMultiplier = np.broadcast_to(1 + takeProfit, (numRuns,))
+
+    # Rows start out as "not in a trade" and only rows where something can happen are visited
+    total = np.full((numBars, numRuns), float(initialCapital))
+    trade = np.zeros((numBars, numRuns), dtype=np.int8)
+    if components:
+        holdings = np.zeros((numBars, numRuns))
+        cash = np.full((numBars, numRuns), float(initialCapital))
+
+    # While every run is out of a trade nothing changes until the next buy signal,
+    # so jump straight to it using the index of the next bar with a Position > 0
+    buySignal = position > 0
+    if buySignal.ndim > 1:
+        buySignal = buySignal.any(axis=1)
+    nextBuy = np.where(buySignal, np.arange(numBars), numBars)
+    nextBuy = np.minimum.accumulate(nextBuy[::-1])[::-1]
+
+    inPosition = np.zeros(numRuns, dtype=bool)
+    entryPrice = np.ones(numRuns)
+    if startState is not None:
+        inPosition = np.broadcast_to(np.asarray(startState[0], dtype=bool), (numRuns,)).copy()
+        entryPrice = np.broadcast_to(np.asarray(startState[1], dtype=np.float64), (numRuns,)).copy()
+
+    i = 0
+    while i < numBars:
+        if not inPosition.any():
+            i = nextBuy[i]
+            if i == numBars:
+                break
+
+        currentPrice = close[i]
+        currentPosition = position[i]
+
+        currentValue = (initialCapital / entryPrice) * currentPrice # Value of the open trade (only used where inPosition)
+
+        buy = ~inPosition & (currentPosition > 0)
+        stopHit = inPosition & (currentPrice <= entryPrice * stopMultiplier)
+        profitHit = inPosition & ~stopHit & (currentPrice >= entryPrice * profitMultiplier)
+        riskExit = stopHit | profitHit
+        signalExit = inPosition & ~riskExit & (currentPosition < 0) # Fall back to the crossover sell signal
+        holding = inPosition & ~riskExit & ~signalExit
+        sell = riskExit | signalExit
+
+        # Stop loss / take profit rows skip the Total update in the original loop, so they keep initialCapital
+        total[i] = np.where(holding, initialCapital + currentValue, np.where(signalExit, currentValue, initialCapital))
+        trade[i] = buy
+        trade[i][sell] = -1
+
+        if components:
+            holdings[i] = np.where(buy, initialCapital, np.where(holding, currentValue, 0.0))
+            cash[i] = np.where(buy, 0.0, np.where(sell, currentValue, initialCapital))
+
+        entryPrice = np.where(buy, currentPrice, entryPrice)
+        inPosition = buy | holding
+        i += 1
+
+    results = (holdings, cash, total, trade) if components else (total, trade)
+    if returnState:
+        results += ((inPosition, entryPrice),)
+    return results
+
+
+def riskLimits(stopLoss=None, takeProfit=None):
+    """
+    Resolves optional stop loss / take profit settings the same way everywhere.
+
+    Returns:
+        tuple: None when both are None (plain crossover backtest), otherwise (stopLoss, takeProfit)
+        with a missing side switched off (a 100% stop loss, an infinite take profit).
+    """
+    if stopLoss is None and takeProfit is None:
+        return None
+    return (1.0 if stopLoss is None else stopLoss, float("inf") if takeProfit is None else takeProfit)
+
+
+def backtestRiskGrid(data, stopLosses, takeProfits, initialCapital=10000):
+    """
+    Backtests every (stopLoss, takeProfit) combination of two lists of thresholds in one call.
+
+    Args:
+        data (pd.DataFrame): Strategy DataFrame with 'Close' and 'Position' columns.
+        stopLosses (list): Stop loss values to try.
+        takeProfits (list): Take profit values to try.
+        initialCapital (float): Starting cash.
+
+    Returns:
+        grid (pd.DataFrame): 'StopLoss' and 'TakeProfit' for each run (one row per column of the matrices).
+        total (np.ndarray): Equity curves, shape (bars, runs).
+        trade (np.ndarray): Trade flags, shape (bars, runs).
+    """
+    stopGrid, profitGrid = np.meshgrid(np.asarray(stopLosses, dtype=np.float64), np.asarray(takeProfits, dtype=np.float64), indexing="ij")
+    grid = pd.DataFrame({"StopLoss": stopGrid.ravel(), "TakeProfit": profitGrid.ravel()})
+
+    total, trade = runRiskControlKernel(
+        data["Close"].to_numpy(), data["Position"].to_numpy(),
+        grid["StopLoss"].to_numpy(), grid["TakeProfit"].to_numpy(), initialCapital
+    )
+    return grid, total, trade
+
+
 def backtestWithRiskControl(data, initialCapital=10000, stopLoss=0.1, takeProfit=0.2):
     """
     Backtests the MA crossover strategy with stop loss and take profit logic.
@@ -19,62 +157,14 @@ def backtestWithRiskControl(data, initialCapital=10000, stopLoss=0.1, takeProfit
     data["Signal"] = data["Signal"].fillna(0)
     data["Position"] = data["Position"].fillna(0)
 
+    # Run the kernel for this single (stopLoss, takeProfit) pair
+    holdings, cash, total, trade = runRiskControlKernel(
+        data["Close"].to_numpy(), data["Position"].to_numpy(), stopLoss, takeProfit, initialCapital, components=True
+    )
+
     # Portfolio state columns
-    data["Holdings"] = 0.0
-    data["Cash"] = float(initialCapital)
-    data["Total"] = float(initialCapital)
-    data["Trade"] = 0.0
-
-    inPosition = False
-    entryPrice = 0.0
-
-    # Loop through each row in the DataFrame (one day at a time)
-    for i in range(len(data)):
-        row = data.iloc[i]  # Get the current row
-
-        currentPrice = row["Close"]  # Price used for entry, stop loss, take profit
-
-        # BUY Condition: If a buy signal appears and no active position exists
-        if row["Position"] > 0 and not inPosition:
-            entryPrice = currentPrice  # Save the entry price
-            data.at[data.index[i], "Holdings"] = initialCapital  # Convert all cash to holdings
-            data.at[data.index[i], "Cash"] = 0.0  # Cash is now fully used
-            data.at[data.index[i], "Trade"] = 1  # Mark trade as Buy
-            inPosition = True  # Flag that a position is now active
-
-        # In a trade, check for stop loss or take profit conditions
-        elif inPosition:
-            # Calculate current value of asset held
-            qty = initialCapital / entryPrice
-            currentValue = qty * currentPrice
-            data.at[data.index[i], "Holdings"] = currentValue  # Update holding value
-
-            # Check for stop loss
-            if currentPrice <= entryPrice * (1 - stopLoss):
-                # Triggered stop loss condition
-                data.at[data.index[i], "Cash"] = currentValue  # Sell the asset
-                data.at[data.index[i], "Holdings"] = 0.0  # No longer holding
-                data.at[data.index[i], "Trade"] = -1  # Mark this as a forced sell
-                inPosition = False  # Exit position
-                continue  # Skip the rest of this row
-
-            # Check for take profit
-            elif currentPrice >= entryPrice * (1 + takeProfit):
-                # Triggered take profit condition
-                data.at[data.index[i], "Cash"] = currentValue
-                data.at[data.index[i], "Holdings"] = 0.0
-                data.at[data.index[i], "Trade"] = -1
-                inPosition = False
-                continue
-
-            # Signel based sell condition
-            elif row["Position"] < 0:
-                # If stop loss and take profit didn’t trigger, fall back to original sell signal
-                data.at[data.index[i], "Cash"] = currentValue
-                data.at[data.index[i], "Holdings"] = 0.0
-                data.at[data.index[i], "Trade"] = -1
-                inPosition = False
-
-        # Portfoltio Update (every row)
-        data.at[data.index[i], "Total"] = data.at[data.index[i], "Cash"] + data.at[data.index[i], "Holdings"]
+    data["Holdings"] = holdings[:, 0]
+    data["Cash"] = cash[:, 0]
+    data["Total"] = total[:, 0]
+    data["Trade"] = trade[:, 0].astype(np.float64)
     return data  # Return the full DataFrame with updated portfolio tracking and trade actions
@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+
+from src.backtestWithRisk import runRiskControlKernel
+from src.streamingStrategy import RollingMean
+
+
+class RunningMetrics:
+    """
+    Accumulates the evaluatePerformance metrics one block of bars at a time.
+
+    Only a handful of running totals are kept between blocks (last close and equity value,
+    running peak, open trade entry, return moments), so memory does not grow with the history.
+    """
+
+    def __init__(self, initialCapital=10000, periodsPerYear=365):
+        self.initialCapital = initialCapital
+        self.periodsPerYear = periodsPerYear
+
+        self.numBars = 0
+        self.finalValue = float(initialCapital)
+        self.numTrades = 0
+        self.exposureBars = 0
+
+        # Trade pairing state: "in a trade" = the last non-zero Trade flag was a buy
+        self.inTrade = False
+        self.entryPrice = np.nan
+        self.completedTrades = 0
+        self.wins = 0
+        self.tradeProfit = 0.0
+        self.grossProfit = 0.0
+        self.grossLoss = 0.0
+
+        # Compounded equity curve (see evaluatePerformance.equityCurve), continued from the last bar
+        self.prevClose = None
+        self.prevEquity = None
+
+        # Bar-to-bar returns: count, mean and sum of squared deviations (merged block by block)
+        self.returnCount = 0
+        self.returnMean = 0.0
+        self.returnM2 = 0.0
+        self.downsideSquares = 0.0
+
+        # Drawdown state
+        self.peak = -np.inf
+        self.lastPeak = 0
+        self.maxDrawdown = np.inf
+        self.maxDrawdownDuration = 0
+
+    def update(self, close, trade):
+        """
+        Adds a block of bars.
+
+        Args:
+            close (np.ndarray): Closing prices of the block.
+            trade (np.ndarray): 'Trade' flags of the block (1 = buy, -1 = sell).
+        """
+        close = np.asarray(close, dtype=np.float64)
+        trade = np.asarray(trade)
+        numBars = len(trade)
+        if numBars == 0:
+            return
+        blockIndex = np.arange(numBars)
+        initialCapital = self.initialCapital
+
+        self.numTrades += int(np.abs(trade).sum())
+
+        # Pair trades as evaluateRunBlock does, starting from the state the last block ended in
+        lastFlag = np.maximum.accumulate(np.where(trade != 0, blockIndex, -1))
+        inTrade = np.where(lastFlag >= 0, trade[np.maximum(lastFlag, 0)] > 0, self.inTrade)
+        wasInTrade = np.concatenate(([self.inTrade], inTrade[:-1]))
+        entries = inTrade & ~wasInTrade
+        exits = ~inTrade & wasInTrade
+
+        lastEntry = np.maximum.accumulate(np.where(entries, blockIndex, -1))
+        entryPrice = np.where(lastEntry >= 0, close[np.maximum(lastEntry, 0)], self.entryPrice)
+
+        tradeProfit = (initialCapital / entryPrice[exits]) * close[exits] - initialCapital
+        self.completedTrades += int(exits.sum())
+        self.wins += int((close[exits] > entryPrice[exits]).sum())
+        self.tradeProfit += tradeProfit.sum()
+        self.grossProfit += tradeProfit[tradeProfit > 0].sum()
+        self.grossLoss -= tradeProfit[tradeProfit < 0].sum()
+        self.exposureBars += int(inTrade.sum())
+
+        # Equity grows by the close-to-close return of every bar a position is held over
+        growth = np.ones(numBars)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            growth[1:] = np.where(inTrade[:-1], close[1:] / close[:-1], 1.0)
+            if self.prevClose is not None and self.inTrade:
+                growth[0] = close[0] / self.prevClose
+        equity = (self.initialCapital if self.prevEquity is None else self.prevEquity) * np.cumprod(growth)
+        self.finalValue = equity[-1]
+        self.prevClose = close[-1]
+        self.inTrade = bool(inTrade[-1])
+        self.entryPrice = entryPrice[-1]
+
+        # Returns, including the one across the boundary with the previous block
+        if self.prevEquity is None:
+            returns = equity[1:] / equity[:-1] - 1
+        else:
+            returns = equity / np.concatenate(([self.prevEquity], equity[:-1])) - 1
+        if len(returns):
+            blockMean = returns.mean()
+            blockM2 = ((returns - blockMean) ** 2).sum()
+            count = self.returnCount + len(returns)
+            delta = blockMean - self.returnMean
+            self.returnMean += delta * len(returns) / count
+            self.returnM2 += blockM2 + delta ** 2 * self.returnCount * len(returns) / count
+            self.returnCount = count
+            self.downsideSquares += (np.minimum(returns, 0.0) ** 2).sum()
+        self.prevEquity = equity[-1]
+
+        # Drawdown against the running peak
+        peak = np.maximum(np.maximum.accumulate(equity), self.peak)
+        globalIndex = blockIndex + self.numBars
+        lastPeak = np.maximum(np.maximum.accumulate(np.where(equity >= peak, globalIndex, -1)), self.lastPeak)
+        self.maxDrawdown = min(self.maxDrawdown, ((equity / peak) - 1).min() * 100)
+        self.maxDrawdownDuration = max(self.maxDrawdownDuration, int((globalIndex - lastPeak).max()))
+        self.peak = peak[-1]
+        self.lastPeak = int(lastPeak[-1])
+
+        self.numBars += numBars
+
+    def results(self) -> dict:
+        """
+        Returns the metrics for every bar added so far, with the same keys as evaluatePerformance.
+        """
+        initialCapital = self.initialCapital
+        with np.errstate(invalid="ignore", divide="ignore"):
+            completed = self.completedTrades
+            winRate = round(self.wins / completed * 100, 2) if completed else "N/A"
+            averageTradeProfit = self.tradeProfit / completed if completed else np.nan
+            profitFactor = np.float64(self.grossProfit) / self.grossLoss if completed else np.nan
+
+            volatility = np.sqrt(self.returnM2 / (self.returnCount - 1)) if self.returnCount > 1 else np.nan
+            downsideDeviation = np.sqrt(self.downsideSquares / self.returnCount) if self.returnCount else np.nan
+            sharpe = self.returnMean / volatility * np.sqrt(self.periodsPerYear) if volatility > 0 else np.nan
+            sortino = self.returnMean / downsideDeviation * np.sqrt(self.periodsPerYear) if downsideDeviation > 0 else np.nan
+
+            years = (self.numBars - 1) / self.periodsPerYear
+            cagr = ((self.finalValue / initialCapital) ** (1 / years) - 1) * 100 if years > 0 else np.nan
+
+        return {
+            "Total Return (%)": float((self.finalValue - initialCapital) / initialCapital * 100),
+            "Number of Trades": self.numTrades,
+            "Win Rate (%)": winRate,
+            "Closed Trade Return (%)": float(self.tradeProfit / initialCapital * 100),
+            "Average Trade P/L": float(averageTradeProfit),
+            "Profit Factor": float(profitFactor),
+            "Sharpe Ratio": float(sharpe),
+            "Sortino Ratio": float(sortino),
+            "Max Drawdown (%)": float(self.maxDrawdown),
+            "Max Drawdown Duration": self.maxDrawdownDuration,
+            "CAGR (%)": float(cagr),
+            "Exposure (%)": self.exposureBars / self.numBars * 100 if self.numBars else np.nan,
+        }
+
+
+class ChunkedMAStrategy:
+    """
+    MA crossover + stop loss / take profit backtest run block by block.
+
+    Rolling-mean sums, the last signal, the open trade and the metric totals are carried
+    from one block to the next, so each block gives exactly the rows applyMAStrategy +
+    backtestWithRiskControl would give for the full history, while only one block is in memory.
+    """
+
+    def __init__(self, shortWindow=10, longWindow=50, initialCapital=10000, stopLoss=0.1, takeProfit=0.2, periodsPerYear=365):
+        self.shortMA = RollingMean(shortWindow)
+        self.longMA = RollingMean(longWindow)
+        self.initialCapital = initialCapital
+        self.stopLoss = stopLoss
+        self.takeProfit = takeProfit
+
+        self.prevSignal = None # None until the first bar (its Position is 0, like the filled NaN in the batch version)
+        self.state = None # (inPosition, entryPrice) from the risk kernel
+        self.metrics = RunningMetrics(initialCapital, periodsPerYear)
+
+    def processBlock(self, block: pd.DataFrame) -> pd.DataFrame:
+        """
+        Runs the next block of bars.
+
+        Args:
+            block (pd.DataFrame): The next bars in time order, with a 'Close' column.
+
+        Returns:
+            pd.DataFrame: The block with 'ShortMA', 'LongMA', 'Signal', 'Position', 'Holdings', 'Cash', 'Total' and 'Trade' added.
+        """
+        close = block["Close"].to_numpy(dtype=np.float64)
+        shortMA = self.shortMA.updateBlock(close)
+        longMA = self.longMA.updateBlock(close)
+
+        # Signal: 1 when the short MA is above the long MA, -1 when below, otherwise 0
+        signal = np.where(shortMA > longMA, 1, np.where(shortMA < longMA, -1, 0))
+        if len(signal) == 0:
+            return block.copy()
+        previous = np.concatenate(([signal[0] if self.prevSignal is None else self.prevSignal], signal[:-1]))
+        position = (signal - previous).astype(np.float64)
+        self.prevSignal = signal[-1]
+
+        holdings, cash, total, trade, self.state = runRiskControlKernel(
+            close, position, self.stopLoss, self.takeProfit, self.initialCapital,
+            components=True, startState=self.state, returnState=True,
+        )
+        self.metrics.update(close, trade[:, 0])
+
+        result = block.copy()
+        result["ShortMA"] = shortMA
+        result["LongMA"] = longMA
+        result["Signal"] = signal
+        result["Position"] = position
+        result["Holdings"] = holdings[:, 0]
+        result["Cash"] = cash[:, 0]
+        result["Total"] = total[:, 0]
+        result["Trade"] = trade[:, 0].astype(np.float64)
+        return result
+
+
+def runChunkedBacktest(blocks, shortWindow=10, longWindow=50, initialCapital=10000, stopLoss=0.1, takeProfit=0.2,
+                       periodsPerYear=365, onBlock=None) -> dict:
+    """
+    Backtests a price history that does not fit in memory, one block of bars at a time.
+
+    Args:
+        blocks (iterable): DataFrames of consecutive bars with a 'Close' column, oldest first
+            (e.g. dataLoader.iterPriceBlocks or pd.read_csv(..., chunksize=N)).
+        onBlock (Callable): Optional; called with every finished block (e.g. to append it to a file).
+            Blocks are dropped after the call, so peak memory depends on the block size, not the history length.
+
+    Returns:
+        dict: The evaluatePerformance metrics for the whole history.
+    """
+    strategy = ChunkedMAStrategy(shortWindow, longWindow, initialCapital, stopLoss, takeProfit, periodsPerYear)
+    for block in blocks:
+        result = strategy.processBlock(block)
+        if onBlock is not None:
+            onBlock(result)
+    return strategy.metrics.results()
@@ -0,0 +1,192 @@
+import os
+import random
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.dataLoader import readPriceStore, missingRanges, mergeIntoStore
+from src.priceProviders import ProviderError, SymbolNotFoundError
+
+
+class TokenBucket:
+    """
+    Thread-safe rate limiter: allows bursts of up to `capacity` requests, refilled at `rate` requests per second.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a request is allowed.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def fetchWithRetry(provider, symbols, start, end, limiter=None, maxRetries=4, backoff=0.5):
+    """
+    Fetches one batch, retrying failed requests with exponential backoff and jitter.
+
+    Every attempt (including retries) waits for the rate limiter. SymbolNotFoundError is not retried.
+    The error raised after the last attempt carries the number of requests made as `attempts`.
+
+    Returns:
+        results (dict): symbol -> DataFrame, as returned by provider.fetch.
+        attempts (int): Requests made.
+    """
+    for attempt in range(maxRetries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return provider.fetch(symbols, start, end), attempt + 1
+        except ProviderError as e:
+            if isinstance(e, SymbolNotFoundError) or attempt == maxRetries:
+                e.attempts = attempt + 1
+                raise
+            # Full jitter: sleep a random time up to backoff * 2^attempt so retrying workers don't move in lockstep
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+
+def planDownloads(symbols, start, end, saveTo, batchSize):
+    """
+    Works out which date ranges every symbol is missing and groups symbols with the same gaps into batches.
+
+    Unreadable stores are deleted so the symbol is fetched again, as in loadPriceArrays.
+
+    Returns:
+        batches (list): (symbols, gaps) pairs, at most batchSize symbols each.
+        upToDate (list): Symbols that already have the whole range stored.
+    """
+    groups = {}
+    upToDate = []
+    for symbol in symbols:
+        storeDir = os.path.join(saveTo, symbol)
+        covered = []
+        if os.path.exists(os.path.join(storeDir, "meta.json")):
+            try:
+                covered = readPriceStore(storeDir)[0]["ranges"]
+            except Exception as e:
+                print(f"Error reading price store {storeDir}: {e}")
+                shutil.rmtree(storeDir, ignore_errors=True)
+
+        gaps = missingRanges(covered, start, end)
+        if gaps:
+            groups.setdefault(tuple(map(tuple, gaps)), []).append(symbol)
+        else:
+            upToDate.append(symbol)
+
+    batches = []
+    for gaps, group in groups.items():
+        for first in range(0, len(group), batchSize):
+            batches.append((group[first:first + batchSize], [list(gap) for gap in gaps]))
+    return batches, upToDate
+
+
+def downloadUniverse(symbols, start: str, end: str, saveTo: str = "data/", provider=None, workers=8,
+                     requestsPerSecond=5.0, burst=None, batchSize=None, maxRetries=4, backoff=0.5) -> pd.DataFrame:
+    """
+    Downloads many symbols into the local price store concurrently.
+
+    Symbols that are missing the same date ranges are fetched together in batches, and batches
+    run on a thread pool (fetching is I/O bound). All requests share one token bucket, so the
+    provider never sees more than requestsPerSecond requests per second (after an initial burst).
+    Failed requests are retried with exponential backoff, and a batch that still fails (or contains
+    an unknown symbol) is retried one symbol at a time, so only the symbols at fault are reported.
+    Each symbol belongs to exactly one batch, so it has a single writer, and its store is replaced
+    atomically. Already-stored ranges are not fetched again, so an interrupted download can simply
+    be run again. A range the provider answered without bars (weekend, holiday, before listing)
+    is stored as covered too.
+
+    Args:
+        symbols (list): Symbols to download.
+        start (str): The start date in 'YYYY-MM-DD' format.
+        end (str): The end date in 'YYYY-MM-DD' format (exclusive).
+        saveTo (str): Root folder of the local price store.
+        provider (PriceProvider): Data source (defaults to YahooProvider).
+        workers (int): Concurrent requests.
+        requestsPerSecond (float): Sustained request rate limit.
+        burst (int): Requests allowed at once before the rate limit applies (defaults to workers).
+        batchSize (int): Symbols per request (defaults to the provider's maxBatchSize).
+        maxRetries (int): Retries per request after the first attempt.
+        backoff (float): Base backoff in seconds (doubled on every retry).
+
+    Returns:
+        pd.DataFrame: One row per symbol: 'Status' ('downloaded', 'up to date', 'not found' or 'failed'),
+        'Bars' fetched, 'Attempts' (requests for its batch), 'Seconds' and 'Error'.
+    """
+    if provider is None:
+        from src.priceProviders import YahooProvider
+        provider = YahooProvider()
+
+    symbols = list(dict.fromkeys(symbols))
+    batchSize = batchSize or provider.maxBatchSize
+    limiter = TokenBucket(requestsPerSecond, burst or workers)
+    batches, upToDate = planDownloads(symbols, start, end, saveTo, batchSize)
+
+    report = {symbol: {"Status": "up to date", "Bars": 0, "Attempts": 0, "Seconds": 0.0, "Error": ""} for symbol in upToDate}
+
+    def runBatch(batchSymbols, gaps):
+        began = time.perf_counter()
+        frames = {symbol: [] for symbol in batchSymbols}
+        attempts = 0
+        try:
+            for gapStart, gapEnd in gaps:
+                results, tries = fetchWithRetry(provider, batchSymbols, gapStart, gapEnd, limiter, maxRetries, backoff)
+                attempts += tries
+                missing = [symbol for symbol in batchSymbols if symbol not in results]
+                if missing:
+                    raise SymbolNotFoundError(missing) # Provider left them out instead of raising
+                for symbol in batchSymbols:
+                    frames[symbol].append(results[symbol])
+        except ProviderError as e:
+            if len(batchSymbols) > 1:
+                # Retry one symbol at a time, so a single bad symbol doesn't take the whole batch down with it
+                rows = {}
+                for symbol in batchSymbols:
+                    rows.update(runBatch([symbol], gaps))
+                return rows
+            return {batchSymbols[0]: {
+                "Status": "not found" if isinstance(e, SymbolNotFoundError) else "failed", "Bars": 0,
+                "Attempts": attempts + getattr(e, "attempts", 0), "Seconds": time.perf_counter() - began, "Error": str(e),
+            }}
+
+        # Only store once every gap has been answered. Answered gaps are covered even without bars,
+        # so weekends, holidays and dates before listing are not asked for again
+        rows = {}
+        for symbol in batchSymbols:
+            mergeIntoStore(os.path.join(saveTo, symbol), frames[symbol], gaps)
+            rows[symbol] = {
+                "Status": "downloaded", "Bars": sum(len(frame) for frame in frames[symbol]), "Attempts": attempts,
+                "Seconds": time.perf_counter() - began, "Error": "",
+            }
+        return rows
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(runBatch, batchSymbols, gaps): batchSymbols for batchSymbols, gaps in batches}
+        for future in as_completed(futures):
+            try:
+                report.update(future.result())
+            except Exception as e:
+                status = "not found" if isinstance(e, SymbolNotFoundError) else "failed"
+                for symbol in futures[future]:
+                    report[symbol] = {"Status": status, "Bars": 0, "Attempts": 0, "Seconds": 0.0, "Error": str(e)}
+
+    report = pd.DataFrame.from_dict(report, orient="index").reindex(symbols)
+    report.index.name = "Symbol"
+    return report
@@ -1,8 +1,8 @@
 import pandas as pd
-from imblearn.over_sampling import SMOTE
-from sklearn.model_selection import train_test_split
 
-def createMLDataset(data, lookahead=3, testSize=0.2, randomState=42):
+from src.featureStore import defaultFeatures
+
+def createMLDataset(data, lookahead=3, testSize=0.2, randomState=42, featureStore=None, symbol=None, indicatorCache=None):
     """
     Prepares features and labels for ML using a lookahead price direction label and applies SMOTE.
 
@@ -11,10 +11,24 @@ def createMLDataset(data, lookahead=3, testSize=0.2, randomState=42):
         lookahead (int): Number of days to look ahead when generating the label.
         testSize (float): Proportion of data to reserve for testing.
         randomState (int): For reproducibility.
+        featureStore (FeatureStore): Optional cache of computed features. Only rows it has not seen are computed.
+        symbol (str): Key used for this data in the feature store (required with featureStore).
+        indicatorCache (IndicatorCache): Optional; reuses rolling indicators already computed for the same prices
+            (e.g. by applyMAStrategy).
 
     Returns:
         X_train, X_test, y_train, y_test: Balanced training sets and untouched test sets
     """
+    if featureStore is not None:
+        if symbol is None:
+            raise ValueError("symbol is required when a featureStore is used.")
+        X, y = buildFeaturesFromStore(data, lookahead, featureStore, symbol)
+        return splitAndBalance(X, y, testSize, randomState)
+
+    if indicatorCache is not None:
+        X, y = buildFeaturesFromCache(data, lookahead, indicatorCache)
+        return splitAndBalance(X, y, testSize, randomState)
+
     df = data.copy()
 
     # Create features and labels
@@ -38,6 +52,89 @@ def createMLDataset(data, lookahead=3, testSize=0.2, randomState=42):
     X = df[featureCols]
     y = df["Label"]
 
+    return splitAndBalance(X, y, testSize, randomState)
+
+
+def buildFeaturesFromStore(data, lookahead, featureStore, symbol, definitions=None):
+    """
+    Builds the same rows as createMLDataset, with the features read from a FeatureStore.
+
+    Returns:
+        X (pd.DataFrame): float32 features.
+        y (pd.Series): Lookahead labels.
+    """
+    definitions = definitions or defaultFeatures
+    source = featureSource(data)
+    features = featureStore.getFeatures(symbol, source, definitions)
+
+    # 1 if future price is higher than current price N days ahead, else 0
+    label = (data["Close"].shift(-lookahead) > data["Close"]).astype(int).rename("Label")[source.index]
+
+    keep = completeRows(source, features, max(definition.lookback for definition in definitions))
+    return features[keep], label[keep]
+
+
+def buildFeaturesFromCache(data, lookahead, indicatorCache):
+    """
+    Builds the same rows and features as createMLDataset, with the indicators read from an IndicatorCache.
+
+    Unless the input has incomplete rows after its start, the indicators are looked up on the full
+    input columns, the same arrays applyMAStrategy uses, so they are shared with it (see featureSource).
+
+    Returns:
+        X (pd.DataFrame): Features.
+        y (pd.Series): Lookahead labels.
+    """
+    source = featureSource(data)
+    close, volume = source["Close"], source["Volume"]
+    features = pd.DataFrame({
+        "Return_1D": indicatorCache.get(close, "pct_change", 1),
+        "MA_5": indicatorCache.get(close, "sma", 5),
+        "MA_10": indicatorCache.get(close, "sma", 10),
+        "Volatility_5D": indicatorCache.get(close, "std", 5),
+        "Volume_Change": indicatorCache.get(volume, "pct_change", 1),
+    }, index=source.index)
+
+    # 1 if future price is higher than current price N days ahead, else 0
+    label = (data["Close"].shift(-lookahead) > data["Close"]).astype(int).rename("Label")[source.index]
+
+    keep = completeRows(source, features, max(definition.lookback for definition in defaultFeatures))
+    return features[keep], label[keep]
+
+
+def featureSource(data):
+    """
+    The rows to compute features on, so they match createMLDataset, which drops incomplete rows first.
+
+    If the incomplete rows are all at the start (e.g. the long moving average warm-up), the full data
+    gives the same values once the feature warm-up after them is dropped (see completeRows), and is
+    used as it is. After a gap further in (e.g. a missing Volume), the incomplete rows are dropped
+    before computing, so features next to the gap compare the rows on either side of it, as in createMLDataset.
+    """
+    complete = data.notna().all(axis=1).to_numpy()
+    first = int(complete.argmax()) if complete.any() else len(complete)
+    return data if complete[first:].all() else data[complete]
+
+
+def completeRows(data, features, warmup):
+    """
+    Mask of the rows createMLDataset keeps: drop incomplete input rows, then the rolling warm-up rows after them.
+    """
+    keep = data.notna().all(axis=1).to_numpy()
+    keptPositions = keep.nonzero()[0]
+    keep[keptPositions[:warmup]] = False
+    keep &= features.notna().all(axis=1).to_numpy()
+    return keep
+
+
+def splitAndBalance(X, y, testSize, randomState):
+    """
+    Splits features/labels chronologically and applies SMOTE to the training part only.
+    """
+    # scikit-learn and imbalanced-learn are slow to import, so only load them when a dataset is built
+    from imblearn.over_sampling import SMOTE
+    from sklearn.model_selection import train_test_split
+
     # Split into training and test sets
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=testSize, random_state=randomState, shuffle=False
@@ -1,41 +1,26 @@
 # Download Historical Data from Yahoo Finance
 
-import yfinance as yf
+import numpy as np
 import pandas as pd
+import json
 import os
+import shutil
 
 
-def downloadPriceData(symbol: str, start: str, end: str, saveTo: str = "data/") -> pd.DataFrame:
+def fetchPriceData(symbol: str, start: str, end: str) -> pd.DataFrame:
     """
-    Download historical price data from Yahoo Finance.
+    Fetch historical price data for one date range from Yahoo Finance.
 
     Args:
         symbol (str): The stock symbol to download data for.
         start (str): The start date in 'YYYY-MM-DD' format.
-        end (str): The end date in 'YYYY-MM-DD' format.
+        end (str): The end date in 'YYYY-MM-DD' format (exclusive).
 
     Returns:
         pd.DataFrame: A DataFrame containing the historical price data.
     """
-    # Check if the data already exists
-    filename = f"{saveTo}{symbol}_{start}_{end}.csv"
-
-    # Try loading cached file first
-    if os.path.exists(filename):
-        print(f"Loading data from {filename}")
-        try:
-            df = pd.read_csv(filename, index_col=0, parse_dates=True)
-
-            # Try converting 'Close' to numeric (this will fail if it's not a clean file)
-            df["Close"] = pd.to_numeric(df["Close"])
-            return df
-
-        except Exception as e:
-            print(f"Error reading cached file: {e}")
-            print("Deleting corrupted file and redownloading...")
-            os.remove(filename)
+    import yfinance as yf # Imported here so loading from the local store doesn't pay for it
 
-    # If no file or deleted bad file, download fresh data
     print(f"Downloading data for {symbol} from {start} to {end}")
     df = yf.download(symbol, start=start, end=end, auto_adjust=False)
 
@@ -43,8 +28,287 @@ def downloadPriceData(symbol: str, start: str, end: str, saveTo: str = "data/")
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.get_level_values(0)
 
-    # Save cleaned version
-    os.makedirs(saveTo, exist_ok=True)
-    df.to_csv(filename)
+    return df
+
+
+def mergeRanges(ranges):
+    """
+    Merges overlapping or touching [start, end) date ranges.
+
+    Args:
+        ranges (list): [start, end] pairs of 'YYYY-MM-DD' strings.
+
+    Returns:
+        list: Sorted, non-overlapping [start, end] pairs.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missingRanges(covered, start, end):
+    """
+    Finds the parts of [start, end) not already covered by the stored ranges.
+
+    Args:
+        covered (list): Merged [start, end] pairs already stored.
+        start (str): Requested start date.
+        end (str): Requested end date (exclusive).
+
+    Returns:
+        list: [start, end] pairs that still need to be fetched.
+    """
+    gaps = []
+    cursor = start
+    for coveredStart, coveredEnd in covered:
+        if coveredEnd <= cursor:
+            continue
+        if coveredStart >= end:
+            break
+        if coveredStart > cursor:
+            gaps.append([cursor, coveredStart])
+        cursor = max(cursor, coveredEnd)
+    if cursor < end:
+        gaps.append([cursor, end])
+    return gaps
+
+
+def readPriceStore(storeDir: str):
+    """
+    Opens a symbol's local price store as memory-mapped arrays.
+
+    The store holds one array of bar timestamps and one row of values per column (columnar),
+    so any column/date slice is a view into the file rather than a copy.
+
+    Args:
+        storeDir (str): The symbol's store folder.
+
+    Returns:
+        meta (dict): Columns, covered ranges, timezone and the current file version.
+        dates (np.ndarray): Bar timestamps as int64 nanoseconds since the epoch, UTC for timezone-aware data (memory-mapped).
+        values (np.ndarray): float64 values shaped (columns, bars) (memory-mapped).
+    """
+    with open(os.path.join(storeDir, "meta.json")) as f:
+        meta = json.load(f)
+
+    version = meta["version"]
+    dates = np.load(os.path.join(storeDir, f"dates.{version}.npy"), mmap_mode="r")
+    values = np.load(os.path.join(storeDir, f"values.{version}.npy"), mmap_mode="r")
+
+    # Validate that the files belong together and contain usable prices
+    if values.shape != (len(meta["columns"]), len(dates)) or "Close" not in meta["columns"]:
+        raise ValueError(f"Store files do not match metadata in {storeDir}")
+    if values.dtype != np.float64 or dates.dtype != np.int64:
+        raise ValueError(f"Unexpected data types in {storeDir}")
+
+    return meta, dates, values
+
+
+def writePriceStore(storeDir: str, df: pd.DataFrame, ranges, oldVersion=None):
+    """
+    Writes a symbol's full price history to the local store.
+
+    New files get a new version number and the metadata is swapped in last with an atomic
+    rename, so readers never see a half-written store and files that are still memory-mapped
+    elsewhere are not overwritten.
+
+    Args:
+        storeDir (str): The symbol's store folder.
+        df (pd.DataFrame): Price data indexed by date.
+        ranges (list): Date ranges covered by df (including ranges with no bars, e.g. holidays).
+        oldVersion (int): Version being replaced, removed afterwards if possible.
+    """
+    os.makedirs(storeDir, exist_ok=True)
+    version = 0 if oldVersion is None else oldVersion + 1
+
+    index = pd.DatetimeIndex(df.index)
+    meta = {
+        "version": version,
+        "columns": [str(column) for column in df.columns],
+        "ranges": mergeRanges(ranges),
+        "tz": str(index.tz) if index.tz is not None else None,
+    }
+    dates = index.as_unit("ns").asi8
+    values = np.ascontiguousarray(df.to_numpy(dtype=np.float64).T)
+
+    np.save(os.path.join(storeDir, f"dates.{version}.npy"), dates)
+    np.save(os.path.join(storeDir, f"values.{version}.npy"), values)
+
+    tempMeta = os.path.join(storeDir, f"meta.json.{os.getpid()}.tmp")
+    with open(tempMeta, "w") as f:
+        json.dump(meta, f)
+    os.replace(tempMeta, os.path.join(storeDir, "meta.json"))
+
+    # Old files may still be memory-mapped by another reader (Windows refuses to delete those)
+    if oldVersion is not None:
+        for name in [f"dates.{oldVersion}.npy", f"values.{oldVersion}.npy"]:
+            try:
+                os.remove(os.path.join(storeDir, name))
+            except OSError:
+                pass
+
+
+def storeToFrame(meta, dates, values) -> pd.DataFrame:
+    """
+    Builds a DataFrame (with its own copy of the data) from stored or sliced arrays.
+    """
+    index = pd.DatetimeIndex(np.array(dates).view("datetime64[ns]"), name="Date")
+    if meta["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    return pd.DataFrame(np.array(values).T, index=index, columns=meta["columns"])
+
+
+def mergeIntoStore(storeDir: str, frames, gaps):
+    """
+    Merges newly fetched frames with a symbol's stored prices and writes the result as a new store version.
+
+    Args:
+        storeDir (str): The symbol's store folder (may not exist yet).
+        frames (list): Newly fetched DataFrames (empty ones are allowed).
+        gaps (list): Date ranges the new frames cover, added to the covered ranges (only up to today).
+    """
+    # Bars from today on may not exist yet (or still change), so a range reaching into the future is
+    # only recorded as covered up to today and the rest is fetched again next time
+    today = pd.Timestamp.today().strftime("%Y-%m-%d")
+    gaps = [[gapStart, min(gapEnd, today)] for gapStart, gapEnd in gaps if gapStart < min(gapEnd, today)]
+
+    meta, dates, values = None, None, None
+    if os.path.exists(os.path.join(storeDir, "meta.json")):
+        meta, dates, values = readPriceStore(storeDir)
+
+    frames = ([storeToFrame(meta, dates, values)] if meta and len(dates) else []) + list(frames)
+    frames = [frame for frame in frames if not frame.empty]
+
+    if frames:
+        merged = pd.concat(frames)
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    else:
+        merged = pd.DataFrame(columns=["Adj Close", "Close", "High", "Low", "Open", "Volume"], index=pd.DatetimeIndex([], name="Date"))
+
+    covered = meta["ranges"] if meta else []
+    oldVersion = meta["version"] if meta else None
+    meta, dates, values = None, None, None # Drop the old memory maps before replacing the files
+    writePriceStore(storeDir, merged, covered + list(gaps), oldVersion)
+
+
+def loadPriceArrays(symbol: str, start: str, end: str, saveTo: str = "data/", provider=None):
+    """
+    Load a symbol's prices between two dates as zero-copy slices of the local store.
+
+    Only date ranges that are not stored yet are fetched from Yahoo Finance and merged
+    into the store. If the store is unreadable it is deleted and fetched again.
+
+    Args:
+        symbol (str): The stock symbol to load.
+        start (str): The start date in 'YYYY-MM-DD' format.
+        end (str): The end date in 'YYYY-MM-DD' format (exclusive).
+        saveTo (str): Root folder of the local price store.
+        provider (PriceProvider): Where to fetch missing ranges from (defaults to Yahoo Finance via fetchPriceData).
+
+    Returns:
+        meta (dict): Store metadata ('columns' gives the row order of values).
+        dates (np.ndarray): int64 nanosecond timestamps for the requested range (view).
+        values (np.ndarray): float64 values shaped (columns, bars) for the requested range (view).
+    """
+    storeDir = os.path.join(saveTo, symbol)
+
+    # Try the local store first
+    meta, dates, values = None, None, None
+    if os.path.exists(os.path.join(storeDir, "meta.json")):
+        try:
+            meta, dates, values = readPriceStore(storeDir)
+        except Exception as e:
+            print(f"Error reading price store {storeDir}: {e}")
+            print("Deleting corrupted store and redownloading...")
+            meta, dates, values = None, None, None
+            shutil.rmtree(storeDir, ignore_errors=True)
+
+    covered = meta["ranges"] if meta else []
+    gaps = missingRanges(covered, start, end)
+
+    # Fetch only the missing date ranges and merge them with what is stored
+    if gaps:
+        if provider is None:
+            frames = [fetchPriceData(symbol, gapStart, gapEnd) for gapStart, gapEnd in gaps]
+        else:
+            frames = [provider.fetch([symbol], gapStart, gapEnd)[symbol] for gapStart, gapEnd in gaps]
+
+        meta, dates, values = None, None, None # Drop the old memory maps before replacing the files
+        mergeIntoStore(storeDir, frames, gaps)
+        meta, dates, values = readPriceStore(storeDir)
+    else:
+        print(f"Loading data from {storeDir}")
+
+    # Binary search the sorted dates so the result is a view of the memory-mapped arrays
+    startNs = pd.Timestamp(start, tz=meta["tz"]).value
+    endNs = pd.Timestamp(end, tz=meta["tz"]).value
+    first, last = np.searchsorted(dates, [startNs, endNs])
+
+    return meta, dates[first:last], values[:, first:last]
+
+
+def downloadPriceData(symbol: str, start: str, end: str, saveTo: str = "data/", provider=None) -> pd.DataFrame:
+    """
+    Download historical price data from Yahoo Finance.
+
+    Prices are kept in a per-symbol binary store under saveTo, so changing the date range
+    only fetches the dates that are not stored yet.
+
+    Args:
+        symbol (str): The stock symbol to download data for.
+        start (str): The start date in 'YYYY-MM-DD' format.
+        end (str): The end date in 'YYYY-MM-DD' format.
+        provider (PriceProvider): Optional data source instead of Yahoo Finance (see priceProviders.py).
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the historical price data.
+    """
+    meta, dates, values = loadPriceArrays(symbol, start, end, saveTo, provider)
+    return storeToFrame(meta, dates, values)
+
+
+def iterPriceBlocks(symbol: str, start: str, end: str, blockSize: int = 1_000_000, saveTo: str = "data/"):
+    """
+    Read a symbol's prices from the local store in blocks of bars, oldest first.
+
+    Each block is read from the store files with plain reads rather than through the memory map
+    (pages of a memory map stay resident once touched), so only one block is held in memory,
+    however long the history is.
+
+    Args:
+        symbol (str): The stock symbol to load.
+        start (str): The start date in 'YYYY-MM-DD' format.
+        end (str): The end date in 'YYYY-MM-DD' format (exclusive).
+        blockSize (int): Bars per block.
+        saveTo (str): Root folder of the local price store.
+
+    Yields:
+        pd.DataFrame: Up to blockSize bars, with the same columns as downloadPriceData.
+    """
+    meta, dates, _ = loadPriceArrays(symbol, start, end, saveTo) # Makes sure the range is stored
+    if len(dates) == 0:
+        return
+
+    # Position of the requested range in the store files
+    _, allDates, allValues = readPriceStore(os.path.join(saveTo, symbol))
+    first = int(np.searchsorted(allDates, dates[0]))
+    last = first + len(dates)
+    numBars = len(allDates)
+
+    with open(allDates.filename, "rb") as datesFile, open(allValues.filename, "rb") as valuesFile:
+        for blockStart in range(first, last, blockSize):
+            size = min(blockSize, last - blockStart)
+            datesFile.seek(allDates.offset + blockStart * 8)
+            blockDates = np.fromfile(datesFile, dtype=np.int64, count=size)
+
+            # values is stored as (columns, bars), so each column's block is one contiguous read
+            blockValues = np.empty((len(meta["columns"]), size))
+            for row in range(len(blockValues)):
+                valuesFile.seek(allValues.offset + (row * numBars + blockStart) * 8)
+                blockValues[row] = np.fromfile(valuesFile, dtype=np.float64, count=size)
 
-    return df
\ No newline at end of file
+            yield storeToFrame(meta, blockDates, blockValues)
\ No newline at end of file
@@ -0,0 +1,107 @@
+import numpy as np
+
+
+def minMaxDownsample(values, numBuckets) -> np.ndarray:
+    """
+    Picks the first, last, lowest and highest point of each bucket of a series.
+
+    Every spike and dip survives, so the line drawn through the picked points looks the
+    same as the full series once each bucket is about one pixel wide.
+
+    Args:
+        values (np.ndarray): Series values (NaNs allowed).
+        numBuckets (int): Number of equal-width buckets, e.g. the plot width in pixels.
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    bucketSize = -(-n // numBuckets) # Ceiling division
+    numBuckets = -(-n // bucketSize)
+
+    # Pad to a whole number of buckets so they can be reduced as one 2-D array
+    padded = np.full(numBuckets * bucketSize, np.nan)
+    padded[:n] = values
+    buckets = padded.reshape(numBuckets, bucketSize)
+    starts = np.arange(numBuckets) * bucketSize
+
+    # NaNs never win a min or max (an all-NaN bucket just returns its first point, which is NaN anyway)
+    lowest = np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1) + starts
+    highest = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1) + starts
+    last = np.minimum(starts + bucketSize, n) - 1
+
+    return np.unique(np.concatenate([starts, lowest, highest, last]))
+
+
+def lttbDownsample(x, y, numPoints) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps one point per bucket: the one forming the largest triangle with the point kept
+    in the previous bucket and the average of the next bucket. Gives a smoother line than
+    minMaxDownsample with fewer points, but can skip single-bar spikes.
+
+    Args:
+        x (np.ndarray): Numeric x values (e.g. timestamps as int64), increasing.
+        y (np.ndarray): Series values. NaN points are dropped.
+        numPoints (int): Number of points to keep (at least 3).
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points.
+    """
+    valid = np.flatnonzero(~np.isnan(np.asarray(y, dtype=np.float64)))
+    x = np.asarray(x, dtype=np.float64)[valid]
+    y = np.asarray(y, dtype=np.float64)[valid]
+    n = len(valid)
+    if numPoints >= n or numPoints < 3:
+        return valid
+
+    # First and last points are always kept; the rest are split into numPoints - 2 buckets
+    edges = np.linspace(1, n - 1, numPoints - 1).astype(np.int64)
+    kept = np.empty(numPoints, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    # Average of every bucket, used as the third corner of the triangle
+    sums = np.add.reduceat(np.column_stack([x, y])[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)[:, None]
+    means = np.vstack([sums / counts, [[x[-1], y[-1]]]])
+
+    previous = 0
+    for bucket in range(numPoints - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        nextX, nextY = means[bucket + 1]
+
+        # Twice the triangle area for every candidate point in this bucket
+        area = np.abs(
+            (x[previous] - nextX) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (nextY - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+
+    return valid[kept]
+
+
+def downsampleIndices(x, y, maxPoints=5000, method="minmax") -> np.ndarray:
+    """
+    Chooses which points of a series to plot.
+
+    Args:
+        x (np.ndarray): Numeric x values (only used by LTTB).
+        y (np.ndarray): Series values.
+        maxPoints (int): Series with up to this many points are not downsampled.
+        method (str): "minmax" (min/max per bucket, keeps every extreme) or "lttb".
+
+    Returns:
+        np.ndarray: Sorted positions of the points to draw.
+    """
+    n = len(y)
+    if not maxPoints or n <= maxPoints:
+        return np.arange(n)
+
+    if method == "minmax":
+        return minMaxDownsample(y, maxPoints // 4) # Up to 4 points per bucket
+    if method == "lttb":
+        return lttbDownsample(x, y, maxPoints)
+    raise ValueError(f"Unknown downsampling method: {method}")
@@ -1,56 +1,200 @@
+import numpy as np
 import pandas as pd
 
 
-def evaluatePerformance(data, initialCapital=10000):
+def evaluatePerformance(data, initialCapital=10000, periodsPerYear=365):
     """
     Evaluates performance of the backtested strategy.
 
+    Returns, risk ratios, drawdowns and CAGR are measured on a compounded equity curve (see equityCurve),
+    not on the 'Total' column, which goes back to initialCapital after every exit.
+
     Args:
-        data (pd.DataFrame): The backtested DataFrame (must include 'Total', 'Trade', 'Cash', 'Holdings', 'Close').
+        data (pd.DataFrame): The backtested DataFrame (must include 'Close' and 'Trade').
         initialCapital (float): Starting capital used in the backtest.
+        periodsPerYear (int): Bars per year, used to annualise Sharpe, Sortino and CAGR (365 for daily crypto, 252 for daily stocks).
 
     Returns:
         dict: A dictionary with performance metrics.
     """
 
-    results = {} # Create a dictionary to hold performance results
+    # Evaluate the backtest as a batch of one run
+    results = evaluateRuns(
+        data["Close"].to_numpy(), data[["Trade"]].to_numpy(), initialCapital, periodsPerYear
+    ).to_dict("records")[0]
 
-    # Calculate Total Return - To measure how much the portfolio grew in % from the starting capital
-    finalValue = data["Total"].iloc[-1] # # Get the last value in the "Total" column (final portfolio value)
-    results["Total Return (%)"] = ((finalValue - initialCapital) / initialCapital) * 100 # # Calculate percentage return from the initial capital to the final value
+    if np.isnan(results["Win Rate (%)"]):
+        results["Win Rate (%)"] = "N/A"  # If no trades were completed, mark as not available
 
+    return results # Return the performance summary as a dictionary
 
-    # Count number of trades - To measure how many trades were executed during the backtest
-    numTrades = data["Trade"].abs().sum() # .abs() makes -1 become 1 (to count both buys and sells), then sum it
-    results["Number of Trades"] = int(numTrades) # # Save the total trade count as an integer
 
-    # Measures what % of trades were profitable
-    trades = data[data["Trade"] != 0].copy() # # Get only rows where trades occurred (1 = buy, -1 = sell)
+def inTradeMask(trade):
+    """
+    Whether each run holds a position after each bar, from trade flags laid out as (runs, bars).
 
+    A buy only counts when not in a trade and a sell only when in one, so after each row
+    "in a trade" = the last non-zero Trade flag was a buy.
+    """
+    barIndex = np.arange(trade.shape[1])
+    lastFlag = np.maximum.accumulate(np.where(trade != 0, barIndex, 0), axis=1)
+    return np.take_along_axis(trade, lastFlag, axis=1) > 0
 
-    tradeResults = [] # Store each trade's profit/loss result
-    inTrade = False # Tracks whether currently in a trade
-    entryPrice = 0.0 # Remembers the price at which it was bought
 
-    for i, row in trades.iterrows(): # Go through each trade row one by one
-        if row["Trade"] == 1 and not inTrade:
-            entryPrice = row["Close"] # Save the price bought at
-            inTrade = True # Mark in a trade now
+def compoundedEquity(close, inTrade, initialCapital):
+    """
+    Equity curves laid out as (runs, bars): the whole account is invested on every entry and earns
+    the close-to-close return of every bar the position is held over.
+    """
+    growth = np.ones(close.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth[:, 1:] = np.where(inTrade[:, :-1], close[:, 1:] / close[:, :-1], 1.0)
+    return initialCapital * np.cumprod(growth, axis=1)
 
 
-        elif row["Trade"] == -1 and inTrade:
-            exitPrice = row["Close"] # Save the price sold at
-            tradeResults.append(exitPrice - entryPrice) # Calculate P/L for the trade
-            inTrade = False # Mark not in a trade anymore
-    
+def equityCurve(close, trade, initialCapital=10000):
+    """
+    Builds the compounded equity curve of a backtest from its closing prices and trade flags.
 
+    Unlike 'Total' (which restarts from initialCapital after every exit), the account keeps
+    its gains and losses: it is fully invested from each buy to the matching sell, at closing
+    prices, and flat in between.
 
-    if tradeResults: # Only run this if at least one trade has been completed
-        wins = [r for r in tradeResults if r > 0]  # Filter only the profitable trades
-        winRate = (len(wins) / len(tradeResults)) * 100  # Percent of profitable trades
-        results["Win Rate (%)"] = round(winRate, 2)  # Round it to 2 decimal places
-    else:
-        results["Win Rate (%)"] = "N/A"  # If no trades were made, mark as not available
+    Args:
+        close (np.ndarray): Closing prices, shape (bars,) or (bars, runs).
+        trade (np.ndarray): Trade flags ('Trade': 1 = buy, -1 = sell), shape (bars,) or (bars, runs).
+        initialCapital (float): Starting capital.
+
+    Returns:
+        np.ndarray: Account value after every bar, shaped like trade.
+    """
+    trade = np.asarray(trade)
+    singleRun = trade.ndim == 1
+    trade = trade.reshape(len(trade), -1).T
+    close = np.broadcast_to(np.asarray(close, dtype=np.float64).reshape(trade.shape[1], -1).T, trade.shape)
+
+    equity = compoundedEquity(close, inTradeMask(trade), initialCapital)
+    return equity[0] if singleRun else equity.T
 
-    return results # Return the performance summary as a dictionary
 
+def evaluateRunBlock(close, trade, initialCapital, periodsPerYear):
+    """
+    Computes every metric for a block of runs laid out as (runs, bars).
+
+    Returns:
+        dict: Metric name -> array with one value per run.
+    """
+    numBars = trade.shape[1]
+    barIndex = np.arange(numBars)
+
+    # Pair trades the same way as walking the trade rows
+    inTrade = inTradeMask(trade)
+    wasInTrade = np.zeros_like(inTrade)
+    wasInTrade[:, 1:] = inTrade[:, :-1]
+    entries = inTrade & ~wasInTrade
+    exits = ~inTrade & wasInTrade
+
+    # Compounded account value, used for the return, risk and drawdown metrics
+    equity = compoundedEquity(close, inTrade, initialCapital)
+
+    # Total Return - how much the account grew in % from the starting capital (open trades at the last close)
+    finalValue = equity[:, -1]
+    totalReturn = ((finalValue - initialCapital) / initialCapital) * 100
+
+    # Number of trades - .abs() makes -1 become 1 (to count both buys and sells)
+    numTrades = np.abs(trade).sum(axis=1).astype(np.int64)
+
+    lastEntry = np.maximum.accumulate(np.where(entries, barIndex, 0), axis=1)
+    entryPrice = np.take_along_axis(close, lastEntry, axis=1)
+
+    # Profit/loss of every completed trade (each trade invests initialCapital)
+    completedTrades = exits.sum(axis=1)
+    wins = (exits & (close > entryPrice)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tradeProfit = np.where(exits, (initialCapital / entryPrice) * close - initialCapital, 0.0)
+        grossProfit = np.where(tradeProfit > 0, tradeProfit, 0.0).sum(axis=1)
+        grossLoss = -np.where(tradeProfit < 0, tradeProfit, 0.0).sum(axis=1)
+
+        winRate = np.round((wins / completedTrades) * 100, 2)
+        closedTradeReturn = (tradeProfit.sum(axis=1) / initialCapital) * 100
+        averageTradeProfit = tradeProfit.sum(axis=1) / completedTrades
+        profitFactor = np.where(completedTrades > 0, grossProfit / grossLoss, np.nan)
+
+        # Bar-to-bar returns of the equity curve for the risk-adjusted ratios (none with a single bar)
+        sharpe = sortino = np.full(len(equity), np.nan)
+        if numBars > 1:
+            returns = equity[:, 1:] / equity[:, :-1] - 1
+            meanReturn = returns.mean(axis=1)
+            volatility = returns.std(axis=1, ddof=1) if numBars > 2 else np.full(len(equity), np.nan)
+            downsideDeviation = np.sqrt((np.minimum(returns, 0.0) ** 2).mean(axis=1))
+            sharpe = np.where(volatility > 0, meanReturn / volatility * np.sqrt(periodsPerYear), np.nan)
+            sortino = np.where(downsideDeviation > 0, meanReturn / downsideDeviation * np.sqrt(periodsPerYear), np.nan)
+
+        # Drawdown - how far the equity curve fell below its previous peak, and the longest time spent below it
+        peak = np.maximum.accumulate(equity, axis=1)
+        maxDrawdown = ((equity / peak) - 1).min(axis=1) * 100
+        lastPeak = np.maximum.accumulate(np.where(equity >= peak, barIndex, 0), axis=1)
+        maxDrawdownDuration = (barIndex - lastPeak).max(axis=1)
+
+        # Compound annual growth rate over the length of the backtest
+        years = (numBars - 1) / periodsPerYear
+        cagr = ((finalValue / initialCapital) ** (1 / years) - 1) * 100 if years > 0 else np.full(len(equity), np.nan)
+
+    # Exposure - share of bars spent in a trade
+    exposure = inTrade.mean(axis=1) * 100
+
+    return {
+        "Total Return (%)": totalReturn,
+        "Number of Trades": numTrades,
+        "Win Rate (%)": winRate,
+        "Closed Trade Return (%)": closedTradeReturn,
+        "Average Trade P/L": averageTradeProfit,
+        "Profit Factor": profitFactor,
+        "Sharpe Ratio": sharpe,
+        "Sortino Ratio": sortino,
+        "Max Drawdown (%)": maxDrawdown,
+        "Max Drawdown Duration": maxDrawdownDuration,
+        "CAGR (%)": cagr,
+        "Exposure (%)": exposure,
+    }
+
+
+def evaluateRuns(close, trade, initialCapital=10000, periodsPerYear=365, maxCells=20_000_000):
+    """
+    Evaluates many backtests at once from their closing prices and trade flags.
+
+    Uses the same definitions as evaluatePerformance, with trades paired using array
+    operations instead of a loop, so thousands of runs (e.g. from a parameter sweep)
+    can be scored in one call.
+
+    Args:
+        close (np.ndarray): Closing prices, shape (bars,) shared by every run or (bars, runs).
+        trade (np.ndarray): Trade flags ('Trade': 1 = buy, -1 = sell), shape (bars, runs).
+        initialCapital (float): Starting capital used in the backtest.
+        periodsPerYear (int): Bars per year, used to annualise Sharpe, Sortino and CAGR.
+        maxCells (int): Upper limit on bars x runs handled per block, to bound memory.
+
+    Returns:
+        pd.DataFrame: One row per run with:
+            'Total Return (%)' (of the compounded equity curve, see equityCurve), 'Number of Trades',
+            'Win Rate (%)' (NaN when no trade was completed),
+            'Closed Trade Return (%)' (profit of all completed trades, each investing initialCapital, as % of initialCapital),
+            'Average Trade P/L' and 'Profit Factor' (gross profit / gross loss) of completed trades,
+            'Sharpe Ratio' and 'Sortino Ratio' (annualised, from bar-to-bar returns of the equity curve),
+            'Max Drawdown (%)' and 'Max Drawdown Duration' (bars) of the equity curve,
+            'CAGR (%)' and 'Exposure (%)' (share of bars in a trade).
+    """
+    # Work in (runs, bars) form so every run is scanned through contiguous memory
+    trade = np.asarray(trade).T
+    close = np.broadcast_to(np.asarray(close, dtype=np.float64).reshape(trade.shape[1], -1).T, trade.shape)
+
+    blockSize = max(1, maxCells // max(trade.shape[1], 1))
+    blocks = [
+        evaluateRunBlock(
+            close[start:start + blockSize], np.ascontiguousarray(trade[start:start + blockSize]),
+            initialCapital, periodsPerYear
+        )
+        for start in range(0, trade.shape[0], blockSize)
+    ]
+
+    return pd.DataFrame({key: np.concatenate([block[key] for block in blocks]) for key in blocks[0]})
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class FeatureDefinition:
+    """
+    A pluggable ML feature.
+
+    Args:
+        name (str): Column name of the feature.
+        compute (Callable): Takes a price DataFrame and returns the feature as a Series with the same index.
+        lookback (int): How many earlier rows a value depends on (e.g. 4 for a 5-bar rolling mean).
+        version (str): Bump when compute changes, so stored values are rebuilt.
+        latest (Callable): Optional NumPy version for the last bar only. Takes a dict of column arrays
+            holding the last lookback + 1 rows and returns the feature value of the last one.
+    """
+    name: str
+    compute: Callable
+    lookback: int
+    version: str = "1"
+    latest: Callable = None
+
+    @property
+    def key(self):
+        return f"{self.name}-{self.lookback}-{self.version}"
+
+
+def dailyReturn(df):
+    return df["Close"].pct_change(fill_method=None) # Daily return
+
+
+def movingAverage5(df):
+    return df["Close"].rolling(window=5).mean() # 5-day moving average
+
+
+def movingAverage10(df):
+    return df["Close"].rolling(window=10).mean() # 10-day moving average
+
+
+def volatility5(df):
+    return df["Close"].rolling(window=5).std() # 5-day rolling std deviation (volatility)
+
+
+def volumeChange(df):
+    return df["Volume"].pct_change(fill_method=None) # Volume change as signal
+
+
+# Last-bar versions of the features above, for scoring one bar without pandas
+def dailyReturnLatest(tail):
+    return tail["Close"][-1] / tail["Close"][-2] - 1
+
+
+def movingAverage5Latest(tail):
+    return tail["Close"][-5:].mean()
+
+
+def movingAverage10Latest(tail):
+    return tail["Close"][-10:].mean()
+
+
+def volatility5Latest(tail):
+    return tail["Close"][-5:].std(ddof=1) # Sample std, as pandas rolling().std()
+
+
+def volumeChangeLatest(tail):
+    return tail["Volume"][-1] / tail["Volume"][-2] - 1
+
+
+# The features used by createMLDataset
+defaultFeatures = [
+    FeatureDefinition("Return_1D", dailyReturn, lookback=1, latest=dailyReturnLatest),
+    FeatureDefinition("MA_5", movingAverage5, lookback=4, latest=movingAverage5Latest),
+    FeatureDefinition("MA_10", movingAverage10, lookback=9, latest=movingAverage10Latest),
+    FeatureDefinition("Volatility_5D", volatility5, lookback=4, latest=volatility5Latest),
+    FeatureDefinition("Volume_Change", volumeChange, lookback=1, latest=volumeChangeLatest),
+]
+
+
+class FeatureStore:
+    """
+    Keeps computed ML features in compact float32 arrays, keyed by symbol and feature definition.
+
+    When a longer history of the same symbol comes in, only the new rows are computed, using
+    just the last `lookback` stored rows as the rolling-window state. Stored rows are only
+    reused if the dates match the start of the new history and a fingerprint of the price
+    columns over the last `fingerprintRows` stored rows is unchanged. Otherwise (different
+    prices under the same symbol, revised recent data) the features are rebuilt.
+    """
+
+    fingerprintRows = 256
+    fingerprintColumns = ("Open", "High", "Low", "Close", "Adj Close", "Volume")
+
+    def __init__(self, saveTo=None):
+        """
+        Args:
+            saveTo (str): Optional folder to persist features between runs (one .npz file per symbol).
+        """
+        self.saveTo = saveTo
+        self.symbols = {} # symbol -> {"index": int64 timestamps, "features": {key: float32 array}, "fingerprint": str}
+
+    def load(self, symbol):
+        if symbol in self.symbols:
+            return self.symbols[symbol]
+
+        entry = {"index": np.empty(0, dtype=np.int64), "features": {}, "fingerprint": ""}
+        path = self.path(symbol)
+        if path and os.path.exists(path):
+            try:
+                with np.load(path) as stored:
+                    keys = json.loads(str(stored["keys"]))
+                    entry = {
+                        "index": stored["index"],
+                        "features": {key: stored[f"feature{i}"] for i, key in enumerate(keys)},
+                        "fingerprint": str(stored["fingerprint"]) if "fingerprint" in stored else "",
+                    }
+            except Exception as e:
+                print(f"Error reading feature file {path}: {e}")
+                print("Rebuilding features from scratch...")
+
+        self.symbols[symbol] = entry
+        return entry
+
+    def path(self, symbol):
+        return os.path.join(self.saveTo, f"{symbol}.npz") if self.saveTo else None
+
+    def save(self, symbol):
+        path = self.path(symbol)
+        if not path:
+            return
+
+        entry = self.symbols[symbol]
+        keys = list(entry["features"])
+        os.makedirs(self.saveTo, exist_ok=True)
+
+        tempPath = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tempPath, index=entry["index"], keys=np.array(json.dumps(keys)), fingerprint=np.array(entry["fingerprint"]),
+            **{f"feature{i}": entry["features"][key] for i, key in enumerate(keys)}
+        )
+        os.replace(tempPath, path)
+
+    def fingerprint(self, data, end):
+        """
+        Hash of the price columns over the `fingerprintRows` rows before position `end`.
+        """
+        columns = [column for column in self.fingerprintColumns if column in data.columns]
+        rows = data[columns].iloc[max(0, end - self.fingerprintRows):end].to_numpy(dtype=np.float64)
+        return hashlib.blake2b(np.ascontiguousarray(rows), digest_size=16).hexdigest()
+
+    def getFeatures(self, symbol, data, definitions=None) -> pd.DataFrame:
+        """
+        Returns features for every row of data, computing only rows that are not stored yet.
+
+        Args:
+            symbol (str): Key for the stored features (e.g. the ticker).
+            data (pd.DataFrame): Price history, oldest first, with the columns the definitions use.
+            definitions (list): FeatureDefinitions to return (defaults to the createMLDataset features).
+
+        Returns:
+            pd.DataFrame: float32 feature columns aligned to data.index.
+        """
+        definitions = definitions or defaultFeatures
+        entry = self.load(symbol)
+        index = pd.DatetimeIndex(data.index).as_unit("ns").asi8 if isinstance(data.index, pd.DatetimeIndex) else np.asarray(data.index, dtype=np.int64)
+
+        # Stored rows are only reused if they are the start of the new history, with the same prices at the end
+        stored = len(entry["index"])
+        if stored and (
+            stored > len(index) or not np.array_equal(entry["index"], index[:stored])
+            or entry.get("fingerprint") != self.fingerprint(data, stored)
+        ):
+            entry["features"] = {}
+            stored = 0
+
+        changed = False
+        for definition in definitions:
+            column = entry["features"].get(definition.key, np.empty(0, dtype=np.float32))
+            done = min(len(column), stored)
+
+            if done < len(index):
+                # Recompute only the new rows, starting `lookback` rows earlier for the rolling windows
+                start = max(0, done - definition.lookback)
+                newValues = definition.compute(data.iloc[start:]).to_numpy(dtype=np.float32)[done - start:]
+                column = np.concatenate([column[:done], newValues])
+                changed = True
+            entry["features"][definition.key] = column
+
+        entry["index"] = index.copy()
+        fingerprint = self.fingerprint(data, len(index))
+        if fingerprint != entry.get("fingerprint"):
+            entry["fingerprint"] = fingerprint
+            changed = True
+        if changed:
+            self.save(symbol)
+
+        return pd.DataFrame(
+            {definition.name: entry["features"][definition.key][:len(index)] for definition in definitions},
+            index=data.index,
+        )
@@ -0,0 +1,154 @@
+import hashlib
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def rollingMean(values, window):
+    return pd.Series(values).rolling(window=window).mean().to_numpy() # Same as data['Close'].rolling(window).mean()
+
+
+def rollingStd(values, window):
+    return pd.Series(values).rolling(window=window).std().to_numpy()
+
+
+def percentChange(values, window):
+    return pd.Series(values).pct_change(periods=window, fill_method=None).to_numpy() # NaN next to missing values, no padding
+
+
+# Indicator name -> function(values, window) returning a float64 array as long as values
+indicators = {
+    "sma": rollingMean,
+    "std": rollingStd,
+    "pct_change": percentChange,
+}
+
+
+def registerIndicator(name, compute):
+    """
+    Makes a new indicator available to every IndicatorCache.
+
+    Args:
+        name (str): Name used in IndicatorCache.get.
+        compute (Callable): Takes a float64 array and a window, returns an array of the same length.
+    """
+    indicators[name] = compute
+
+
+def seriesFingerprint(values) -> str:
+    """
+    Content hash of a series, so the same prices are recognised whichever DataFrame they come from.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return hashlib.blake2b(values, digest_size=16).hexdigest()
+
+
+class IndicatorCache:
+    """
+    Computes each indicator once per series and shares it between strategies and feature builders.
+
+    Results are keyed by (series, indicator, window) and kept in least-recently-used order.
+    When the stored arrays go over the memory budget, the least recently used ones are
+    dropped. Stored arrays are read-only, because every caller gets the same array.
+
+    Hashing a long series costs about as much as a cheap indicator, so the hash is remembered
+    per input array (while that array is alive) and looking up several indicators of the same
+    prices hashes them once. Prices must therefore not be changed in place after a lookup
+    (call clear() if they are).
+    """
+
+    maxFingerprints = 64
+
+    def __init__(self, maxBytes=256 * 1024 ** 2):
+        """
+        Args:
+            maxBytes (int): Memory budget for the stored arrays.
+        """
+        self.maxBytes = maxBytes
+        self.entries = OrderedDict() # (series key, indicator, window) -> array, least recently used first
+        self.fingerprints = OrderedDict() # (buffer id, address, shape, strides) -> (weakref to buffer, hash)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def fingerprint(self, values) -> str:
+        """
+        seriesFingerprint of values, reused when the same array (or a view with the same layout) comes back.
+        """
+        root = values
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        key = (id(root), values.__array_interface__["data"][0], values.shape, values.strides)
+
+        # The weak reference tells a live array apart from a new one that reused a freed array's id
+        memo = self.fingerprints.get(key)
+        if memo is not None and memo[0]() is root:
+            self.fingerprints.move_to_end(key)
+            return memo[1]
+
+        fingerprint = seriesFingerprint(values)
+        self.fingerprints[key] = (weakref.ref(root), fingerprint)
+        if len(self.fingerprints) > self.maxFingerprints:
+            self.fingerprints.popitem(last=False)
+        return fingerprint
+
+    def get(self, series, indicator, window, seriesKey=None) -> np.ndarray:
+        """
+        Returns an indicator of a series, computing it only if it is not cached.
+
+        Args:
+            series (pd.Series or np.ndarray): Input values, e.g. data['Close'].
+            indicator (str): Registered indicator name ('sma', 'std', 'pct_change', ...).
+            window (int): Window length (periods for 'pct_change').
+            seriesKey (str): Optional name for the series (e.g. 'SPY:Close'). Defaults to a hash of its
+                values. Only pass one if the values behind a name never change.
+
+        Returns:
+            np.ndarray: Read-only float64 array aligned with series.
+        """
+        if indicator not in indicators:
+            raise ValueError(f"Unknown indicator: {indicator}")
+
+        values = series.to_numpy(dtype=np.float64) if isinstance(series, pd.Series) else np.asarray(series, dtype=np.float64)
+        key = (seriesKey or self.fingerprint(values), indicator, int(window))
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        result = np.asarray(indicators[indicator](values, int(window)), dtype=np.float64)
+        result.setflags(write=False)
+
+        if result.nbytes <= self.maxBytes:
+            self.entries[key] = result
+            self.nbytes += result.nbytes
+            while self.nbytes > self.maxBytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+
+        return result
+
+    def clear(self):
+        self.entries.clear()
+        self.fingerprints.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counts, the hit rate (%) and the memory in use.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Hit Rate (%)": self.hits / lookups * 100 if lookups else np.nan,
+            "Evictions": self.evictions,
+            "Entries": len(self.entries),
+            "Memory (MB)": self.nbytes / 1024 ** 2,
+        }
@@ -0,0 +1,241 @@
+import importlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.featureStore import FeatureDefinition, defaultFeatures
+
+
+def saveModelArtifact(model, path, definitions=None, version="1", lookahead=3):
+    """
+    Saves a trained random forest as flat NumPy arrays together with its feature definitions.
+
+    Every tree is packed into shared node arrays (feature, threshold, children, leaf
+    probabilities), written as .npy files that can be memory-mapped back in, plus a
+    meta.json with the version tag and how to rebuild the features.
+
+    Args:
+        model: Trained RandomForestClassifier (e.g. from trainAndEvaluateModel).
+        path (str): Folder to write the artifact to.
+        definitions (list): FeatureDefinitions the model was trained on, in column order (defaults to the createMLDataset features).
+        version (str): Version tag stored with the model.
+        lookahead (int): Label horizon the model predicts.
+    """
+    definitions = definitions or defaultFeatures
+    trees = [estimator.tree_ for estimator in model.estimators_]
+
+    nodeCounts = [tree.node_count for tree in trees]
+    offsets = np.concatenate(([0], np.cumsum(nodeCounts)))
+    feature, threshold, children, leafProba = [], [], [], []
+
+    for tree, offset in zip(trees, offsets[:-1]):
+        nodeIds = np.arange(tree.node_count) + offset
+        isLeaf = tree.children_left == -1
+
+        # Leaves point back to themselves, so every tree can be walked for a fixed number of steps
+        children.append(np.stack([
+            np.where(isLeaf, nodeIds, tree.children_left + offset),
+            np.where(isLeaf, nodeIds, tree.children_right + offset),
+        ], axis=1)) # Column 0 = left child, column 1 = right child
+        feature.append(np.where(isLeaf, 0, tree.feature))
+        threshold.append(np.where(isLeaf, np.inf, tree.threshold))
+
+        counts = tree.value[:, 0, :]
+        leafProba.append(counts / counts.sum(axis=1, keepdims=True))
+
+    os.makedirs(path, exist_ok=True)
+    arrays = {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "children": np.concatenate(children).astype(np.int32),
+        "leafProba": np.concatenate(leafProba).astype(np.float64),
+        "roots": offsets[:-1].astype(np.int32),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+
+    meta = {
+        "version": version,
+        "lookahead": lookahead,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "classes": [int(c) for c in model.classes_],
+        "maxDepth": int(max(tree.max_depth for tree in trees)),
+        "features": [
+            {
+                "name": definition.name, "lookback": definition.lookback, "version": definition.version,
+                "compute": functionPath(definition.compute), "latest": functionPath(definition.latest),
+            }
+            for definition in definitions
+        ],
+    }
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def functionPath(function):
+    return None if function is None else f"{function.__module__}:{function.__qualname__}"
+
+
+def importFunction(path):
+    if path is None:
+        return None
+    moduleName, functionName = path.split(":")
+    return getattr(importlib.import_module(moduleName), functionName)
+
+
+def loadModelArtifact(path, mmap=True):
+    """
+    Loads a saved model for inference. Only NumPy is needed, not scikit-learn, SMOTE or the training code.
+
+    Args:
+        path (str): Folder written by saveModelArtifact.
+        mmap (bool): Memory-map the node arrays instead of reading them into memory.
+
+    Returns:
+        ForestPredictor: Ready to score bars.
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    mode = "r" if mmap else None
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+        for name in ["feature", "threshold", "children", "leafProba", "roots"]
+    }
+
+    definitions = [
+        FeatureDefinition(
+            spec["name"], importFunction(spec["compute"]), spec["lookback"], spec["version"], importFunction(spec.get("latest"))
+        )
+        for spec in meta["features"]
+    ]
+
+    return ForestPredictor(meta, arrays, definitions)
+
+
+class ForestPredictor:
+    """
+    Random forest inference over flat node arrays.
+
+    All trees are walked at the same time with NumPy indexing, so a single bar is scored in
+    a few dozen vector steps (one per tree level) instead of a Python call per tree. Large
+    batches are scored in bounded chunks of rows, one tree at a time, and pairs that have
+    reached a leaf stop walking, so memory stays flat and shallow paths finish early.
+    """
+
+    maxCells = 2 ** 16 # (row, tree) pairs walked at once
+
+    def __init__(self, meta, arrays, definitions):
+        self.meta = meta
+        self.version = meta["version"]
+        self.classes = np.array(meta["classes"])
+        self.maxDepth = meta["maxDepth"]
+        self.definitions = definitions
+        self.featureNames = [definition.name for definition in definitions]
+        self.tailSize = max(definition.lookback for definition in definitions) + 1 # Rows needed to compute one bar's features
+
+        # Plain ndarray views of the (possibly memory-mapped) files: indexing np.memmap objects is much slower
+        self.feature = np.asarray(arrays["feature"])
+        self.threshold = np.asarray(arrays["threshold"])
+        self.children = np.asarray(arrays["children"])
+        self.leafProba = np.asarray(arrays["leafProba"])
+        self.roots = np.asarray(arrays["roots"])
+        self.isLeaf = self.children[:, 0] == np.arange(len(self.children)) # Leaves point to themselves
+
+    def predictProba(self, X):
+        """
+        Class probabilities for a feature matrix, shape (rows, features) -> (rows, classes).
+        """
+        X = np.asarray(X, dtype=np.float32) # Same precision scikit-learn uses when splitting
+        if X.ndim == 1:
+            X = X[None, :]
+
+        # Blocks of at most maxCells (row, tree) pairs: all trees at once for a few rows, one tree at a
+        # time for large batches (a single tree's nodes stay in cache while every row walks it)
+        proba = np.zeros((len(X), self.leafProba.shape[1]))
+        chunkRows = min(len(X), self.maxCells) or 1
+        treesPerWalk = max(1, self.maxCells // chunkRows)
+        for start in range(0, len(X), chunkRows):
+            for first in range(0, len(self.roots), treesPerWalk):
+                proba[start:start + chunkRows] += self.walkTrees(X[start:start + chunkRows], self.roots[first:first + treesPerWalk])
+        return proba / len(self.roots)
+
+    def walkTrees(self, X, roots):
+        """
+        Leaf probabilities of the given trees for a block of rows, summed over the trees.
+        """
+        flatX = np.ascontiguousarray(X).ravel()
+        flatChildren = self.children.ravel() # Left child at 2 * node, right child at 2 * node + 1
+        nodes = np.tile(roots, len(X)) # (row, tree) pairs, row-major
+
+        # Walk only the pairs that are still at a split node, stopping once every pair has reached a leaf
+        active = np.flatnonzero(~self.isLeaf[nodes])
+        current = nodes[active]
+        rowOffsets = active // len(roots) * X.shape[1]
+        while len(active):
+            goRight = flatX[rowOffsets + self.feature[current]] > self.threshold[current]
+            current = flatChildren[2 * current + goRight]
+            reached = self.isLeaf[current]
+            finished = np.count_nonzero(reached)
+            if finished == len(current):
+                nodes[active] = current
+                break
+            # Dropping finished pairs costs a pass over the arrays, so wait until a quarter of them are done
+            # (a pair left at a leaf stays there, as leaves point to themselves)
+            if finished > len(current) // 4:
+                nodes[active[reached]] = current[reached]
+                stillSplitting = ~reached
+                active, current, rowOffsets = active[stillSplitting], current[stillSplitting], rowOffsets[stillSplitting]
+
+        return self.leafProba[nodes].reshape(len(X), len(roots), -1).sum(axis=1)
+
+    def predict(self, X):
+        return self.classes[np.argmax(self.predictProba(X), axis=1)]
+
+    def buildFeatures(self, data, numBars=1):
+        """
+        Computes features for the last numBars rows of data, using only the tail of rows they depend on.
+        """
+        tail = data.iloc[-(numBars + self.tailSize - 1):]
+        features = pd.DataFrame({definition.name: definition.compute(tail) for definition in self.definitions})
+        return features.iloc[-numBars:]
+
+    def latestFeatures(self, data):
+        """
+        Features of the last bar as a NumPy row, computed with each definition's NumPy `latest` function.
+        Falls back to buildFeatures when a definition has none.
+        """
+        if any(definition.latest is None for definition in self.definitions):
+            return self.buildFeatures(data, 1).to_numpy()[0]
+
+        # Plain arrays of the last few values: much faster than pandas rolling windows on a tail DataFrame
+        tail = {column: data[column].to_numpy()[-self.tailSize:] for column in data.columns}
+        return np.array([definition.latest(tail) for definition in self.definitions], dtype=np.float64)
+
+    def scoreLatest(self, data):
+        """
+        Predicts the latest bar of a price history.
+
+        Returns:
+            tuple: (predicted class, probability of an up move).
+        """
+        proba = self.predictProba(self.latestFeatures(data))[0]
+        return int(self.classes[np.argmax(proba)]), float(proba[list(self.classes).index(1)])
+
+    def scoreBatch(self, data, numBars=None):
+        """
+        Predicts the last numBars bars (all bars if not given).
+
+        Returns:
+            pd.DataFrame: 'Prediction' and 'Probability (Up)' per bar (rows without full feature history are dropped).
+        """
+        numBars = numBars or len(data)
+        features = self.buildFeatures(data, numBars).dropna()
+        proba = self.predictProba(features.to_numpy())
+        return pd.DataFrame({
+            "Prediction": self.classes[np.argmax(proba, axis=1)],
+            "Probability (Up)": proba[:, list(self.classes).index(1)],
+        }, index=features.index)
@@ -0,0 +1,157 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.movingAverageStrategy import movingAverageMatrix, crossoverSignals, applyMAStrategy
+from src.backtestWithRisk import runRiskControlKernel, backtestWithRiskControl
+from src.evaluatePerformance import evaluateRuns, evaluatePerformance
+
+
+def blockBootstrapPaths(close, numPaths, blockSize=20, rng=None) -> np.ndarray:
+    """
+    Resamples a price history into new paths by stitching together random blocks of its log returns.
+
+    Keeping returns in blocks preserves short-term patterns (volatility clusters, trends) that
+    resampling single days would destroy.
+
+    Args:
+        close (np.ndarray): Historical closing prices, shape (bars,).
+        numPaths (int): Number of paths to generate.
+        blockSize (int): Consecutive returns per block.
+        rng (np.random.Generator): Random generator (a fixed seed is used if not given).
+
+    Returns:
+        np.ndarray: Simulated closes, shape (bars, numPaths). Every path starts at close[0].
+    """
+    rng = rng or np.random.default_rng(42)
+    logReturns = np.diff(np.log(np.asarray(close, dtype=np.float64)))
+    numReturns = len(logReturns)
+    blockSize = max(1, min(blockSize, numReturns))
+
+    # Random block starts, expanded to the return positions they cover, trimmed to the history length
+    numBlocks = -(-numReturns // blockSize)
+    starts = rng.integers(0, numReturns - blockSize + 1, size=(numPaths, numBlocks))
+    positions = (starts[:, :, None] + np.arange(blockSize)).reshape(numPaths, -1)[:, :numReturns]
+
+    return pathsFromLogReturns(close[0], logReturns[positions].T)
+
+
+def gbmPaths(close, numPaths, rng=None) -> np.ndarray:
+    """
+    Simulates geometric Brownian motion paths with the drift and volatility of the historical log returns.
+
+    Returns:
+        np.ndarray: Simulated closes, shape (bars, numPaths). Every path starts at close[0].
+    """
+    rng = rng or np.random.default_rng(42)
+    logReturns = np.diff(np.log(np.asarray(close, dtype=np.float64)))
+    shocks = rng.normal(logReturns.mean(), logReturns.std(ddof=1), size=(len(logReturns), numPaths))
+    return pathsFromLogReturns(close[0], shocks)
+
+
+def pathsFromLogReturns(startPrice, logReturns):
+    paths = np.empty((len(logReturns) + 1, logReturns.shape[1]))
+    paths[0] = startPrice
+    paths[1:] = startPrice * np.exp(np.cumsum(logReturns, axis=0))
+    return paths
+
+
+def simulateBatch(close, numPaths, seed, settings):
+    """
+    Generates one batch of paths and backtests all of them at once.
+
+    Returns:
+        pd.DataFrame: evaluateRuns metrics, one row per path.
+    """
+    rng = np.random.default_rng(seed)
+    if settings["method"] == "bootstrap":
+        paths = blockBootstrapPaths(close, numPaths, settings["blockSize"], rng)
+    elif settings["method"] == "gbm":
+        paths = gbmPaths(close, numPaths, rng)
+    else:
+        raise ValueError(f"Unknown simulation method: {settings['method']}")
+
+    return backtestPaths(paths, settings)
+
+
+def backtestPaths(paths, settings):
+    """
+    Crossover signals + risk-controlled backtest + metrics for every column of a (bars, paths) matrix.
+    """
+    averages = movingAverageMatrix(paths, [settings["shortWindow"], settings["longWindow"]])
+    _, position = crossoverSignals(averages[:, :, 0], averages[:, :, 1])
+    _, trade = runRiskControlKernel(
+        paths, position, settings["stopLoss"], settings["takeProfit"], settings["initialCapital"]
+    )
+    return evaluateRuns(paths, trade, settings["initialCapital"], settings["periodsPerYear"])
+
+
+def runMonteCarlo(data, numPaths=10_000, method="bootstrap", blockSize=20, shortWindow=10, longWindow=50,
+                  stopLoss=0.1, takeProfit=0.2, initialCapital=10000, periodsPerYear=365,
+                  percentiles=(5, 25, 50, 75, 95), seed=42, workers=1, maxCells=5_000_000):
+    """
+    Backtests the MA crossover strategy with stop loss / take profit on thousands of simulated price paths.
+
+    Paths are generated and backtested in batches: each batch is one (bars, paths) Close matrix,
+    and the signals, the risk-control kernel and the metrics all run on the whole matrix at once.
+    Every batch has its own seed, so results are the same whatever the number of workers.
+
+    Args:
+        data (pd.DataFrame): Historical prices with a 'Close' column (no missing values).
+        numPaths (int): Number of simulated paths.
+        method (str): "bootstrap" (block bootstrap of historical returns) or "gbm" (geometric Brownian motion fitted to them).
+        blockSize (int): Returns per block for the bootstrap.
+        shortWindow (int): Short moving average window.
+        longWindow (int): Long moving average window.
+        stopLoss (float): Stop loss (e.g. 0.1 = 10%).
+        takeProfit (float): Take profit (e.g. 0.2 = 20%).
+        initialCapital (float): Starting cash for every path.
+        periodsPerYear (int): Bars per year for the annualised metrics.
+        percentiles (tuple): Percentiles reported in the bands table.
+        seed (int): Base random seed.
+        workers (int): Processes to split the batches across (None = all CPUs).
+        maxCells (int): Upper limit on bars x paths per batch, to bound memory.
+
+    Returns:
+        paths (pd.DataFrame): evaluatePerformance metrics for every simulated path.
+        bands (pd.DataFrame): Percentiles of every metric across paths, plus the 'Historical' value.
+    """
+    close = data["Close"].to_numpy(dtype=np.float64)
+    if np.isnan(close).any():
+        raise ValueError("Close prices must not contain missing values.")
+
+    settings = {
+        "method": method, "blockSize": blockSize, "shortWindow": shortWindow, "longWindow": longWindow,
+        "stopLoss": stopLoss, "takeProfit": takeProfit, "initialCapital": initialCapital, "periodsPerYear": periodsPerYear,
+    }
+
+    # Split the paths into batches, each with an independent seed
+    batchSize = max(1, min(numPaths, maxCells // len(close)))
+    sizes = [min(batchSize, numPaths - start) for start in range(0, numPaths, batchSize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sizes)))
+    if workers == 1:
+        results = [simulateBatch(close, size, batchSeed, settings) for size, batchSeed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulateBatch, [close] * len(sizes), sizes, seeds, [settings] * len(sizes)))
+
+    paths = pd.concat(results, ignore_index=True)
+    paths.index.name = "Path"
+
+    # Percentile bands across paths (NaN metrics, e.g. Win Rate with no completed trades, are left out)
+    bands = pd.DataFrame(
+        np.nanpercentile(paths.to_numpy(dtype=np.float64), percentiles, axis=0).T,
+        index=paths.columns, columns=[f"P{p}" for p in percentiles],
+    )
+    # The real backtest of the historical prices, through the same functions as main.py
+    historical = evaluatePerformance(
+        backtestWithRiskControl(applyMAStrategy(data[["Close"]].copy(), shortWindow, longWindow), initialCapital, stopLoss, takeProfit),
+        initialCapital, periodsPerYear,
+    )
+    bands["Historical"] = pd.Series(historical).replace("N/A", np.nan).astype(float)
+
+    return paths, bands
@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 
-def applyMAStrategy(data: pd.DataFrame, shortWindow: int = 10, longWindow: int = 50) -> pd.DataFrame:
+def applyMAStrategy(data: pd.DataFrame, shortWindow: int = 10, longWindow: int = 50, indicatorCache=None) -> pd.DataFrame:
     """
     Applies a simple Moving Average Crossover strategy.
 
@@ -8,6 +9,7 @@ def applyMAStrategy(data: pd.DataFrame, shortWindow: int = 10, longWindow: int =
         data (pd.DataFrame): The historical price data (must include 'Close' column).
         shortWindow (int): The period for the short-term moving average.
         longWindow (int): The period for the long-term moving average.
+        indicatorCache (IndicatorCache): Optional; reuses moving averages already computed for the same prices.
 
     Returns:
         pd.DataFrame: Original data with added columns for moving averages and signals.
@@ -18,8 +20,12 @@ def applyMAStrategy(data: pd.DataFrame, shortWindow: int = 10, longWindow: int =
         raise ValueError("DataFrame must contain a 'Close' column.")
     
     # Calculate short and long moving averages
-    data['ShortMA'] = data['Close'].rolling(window=shortWindow).mean() # Short-term moving average (sets the .rolling(window) = to shortWindow (shortWindow = 10))
-    data['LongMA'] = data['Close'].rolling(window=longWindow).mean() # Long-term moving average (sets the .rolling(window) = to longWindow (longWindow = 50))
+    if indicatorCache is not None:
+        data['ShortMA'] = indicatorCache.get(data['Close'], "sma", shortWindow) # Same values, computed once per price series
+        data['LongMA'] = indicatorCache.get(data['Close'], "sma", longWindow)
+    else:
+        data['ShortMA'] = data['Close'].rolling(window=shortWindow).mean() # Short-term moving average (sets the .rolling(window) = to shortWindow (shortWindow = 10))
+        data['LongMA'] = data['Close'].rolling(window=longWindow).mean() # Long-term moving average (sets the .rolling(window) = to longWindow (longWindow = 50))
 
     # Generate signals column
     """
@@ -39,4 +45,54 @@ def applyMAStrategy(data: pd.DataFrame, shortWindow: int = 10, longWindow: int =
     # Create a "position" column to track the current position
     data["Position"] = data["Signal"].diff() # finds the difference between the current signal and the previous signal
 
-    return data
\ No newline at end of file
+    return data
+
+def movingAverageMatrix(close, windows) -> np.ndarray:
+    """
+    Computes simple moving averages of 'Close' for many window lengths, each distinct window once.
+
+    Every average is pandas' rolling(window).mean(), the same call applyMAStrategy makes, so the
+    values match it bit for bit. A prefix-sum shortcut would differ in the last digits, which turns
+    ties (ShortMA == LongMA on flat or rounded prices) into phantom crossovers.
+
+    Args:
+        close (np.ndarray): Closing prices, shape (bars,) or (bars, paths) for many price paths at once.
+        windows (list): Window lengths to compute.
+
+    Returns:
+        np.ndarray: Moving averages, shape (bars, len(windows)) for 1-D input or
+        (bars, paths, len(windows)) for 2-D input, one slice per window.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    prices = pd.DataFrame(close.reshape(len(close), -1))
+
+    averages = np.full(prices.shape + (len(windows),), np.nan)
+    for window in np.unique(windows):
+        columns = np.flatnonzero(np.asarray(windows) == window)
+        averages[:, :, columns] = prices.rolling(window=int(window)).mean().to_numpy()[:, :, None]
+
+    return averages[:, 0, :] if close.ndim == 1 else averages
+
+
+def crossoverSignals(shortMA, longMA):
+    """
+    Builds 'Signal' and 'Position' arrays from short and long moving averages.
+
+    Same logic as applyMAStrategy (1 = short above long, -1 = short below long, 0 otherwise,
+    Position = change in Signal), but on arrays of any shape with bars along the first axis,
+    so a whole grid of window pairs can be handled at once.
+
+    Args:
+        shortMA (np.ndarray): Short-term moving averages, shape (bars,) or (bars, runs).
+        longMA (np.ndarray): Long-term moving averages, same shape as shortMA.
+
+    Returns:
+        signal (np.ndarray): int8 signals.
+        position (np.ndarray): int8 signal changes (first row is 0 instead of NaN).
+    """
+    signal = (shortMA > longMA).astype(np.int8) - (shortMA < longMA).astype(np.int8)
+
+    position = np.zeros_like(signal)
+    position[1:] = np.diff(signal, axis=0)
+
+    return signal, position
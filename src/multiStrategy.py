@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.indicatorCache import IndicatorCache, seriesFingerprint
+from src.movingAverageStrategy import crossoverSignals
+from src.backtestStrategy import runMAStrategyEngine
+from src.backtestWithRisk import runRiskControlKernel, riskLimits
+from src.evaluatePerformance import evaluateRuns
+
+
+@dataclass(frozen=True)
+class StrategyDefinition:
+    """
+    A strategy for runStrategies.
+
+    Args:
+        name (str): Label of the strategy in the results.
+        signal (Callable): Takes an indicator getter, get(indicator, window), plus the closing prices and
+            returns the Signal array (1 = long, -1 = out, 0 = no view). Indicators from the getter are shared
+            with every other strategy in the run.
+        stopLoss (float): Stop loss (e.g. 0.1 = 10%). Leave both None for the plain crossover backtest (see riskLimits).
+        takeProfit (float): Take profit (e.g. 0.2 = 20%).
+    """
+    name: str
+    signal: Callable
+    stopLoss: float = None
+    takeProfit: float = None
+
+
+def crossoverStrategy(shortWindow=10, longWindow=50, stopLoss=None, takeProfit=None) -> StrategyDefinition:
+    """
+    The applyMAStrategy moving average crossover as a StrategyDefinition.
+    """
+    def signal(get, close):
+        return crossoverSignals(get("sma", shortWindow), get("sma", longWindow))[0]
+
+    return StrategyDefinition(f"MA {shortWindow}/{longWindow}{riskLabel(stopLoss, takeProfit)}", signal, stopLoss, takeProfit)
+
+
+def trendStrategy(window=50, stopLoss=None, takeProfit=None) -> StrategyDefinition:
+    """
+    Long while the price is above its moving average, out while it is below.
+    """
+    def signal(get, close):
+        return crossoverSignals(close, get("sma", window))[0]
+
+    return StrategyDefinition(f"Trend {window}{riskLabel(stopLoss, takeProfit)}", signal, stopLoss, takeProfit)
+
+
+def riskLabel(stopLoss, takeProfit):
+    limits = riskLimits(stopLoss, takeProfit)
+    return "" if limits is None else f" SL {limits[0]:g} TP {limits[1]:g}"
+
+
+def runStrategies(data, strategies, indicatorCache=None, initialCapital=10000, periodsPerYear=365) -> tuple:
+    """
+    Backtests many strategies on the same prices in one pass over the bars.
+
+    Every strategy's signals are built from one shared IndicatorCache, so an indicator used by
+    several strategies (e.g. the 50-bar moving average) is computed once. The positions of all
+    strategies are then stacked into one (bars, strategies) matrix and run through the array
+    backtest engines together: one call for the plain strategies, one for the risk-controlled ones.
+    The input DataFrame is not modified.
+
+    Args:
+        data (pd.DataFrame): Price data with a 'Close' column.
+        strategies (list): StrategyDefinitions to run (e.g. crossoverStrategy(10, 50)).
+        indicatorCache (IndicatorCache): Cache to use (a new one if not given). Pass the same cache to
+            later runs, applyMAStrategy or createMLDataset to reuse its indicators there too.
+        initialCapital (float): Starting cash for every strategy.
+        periodsPerYear (int): Bars per year for the annualised metrics.
+
+    Returns:
+        results (pd.DataFrame): evaluateRuns metrics, one row per strategy (in the given order).
+        cacheStats (dict): IndicatorCache.stats() after the run (hits, misses, hit rate).
+    """
+    if "Close" not in data.columns:
+        raise ValueError("DataFrame must contain a 'Close' column.")
+    if not strategies:
+        raise ValueError("No strategies to run.")
+
+    cache = indicatorCache if indicatorCache is not None else IndicatorCache()
+    close = data["Close"].to_numpy(dtype=np.float64)
+    seriesKey = seriesFingerprint(close) # Hash the prices once instead of on every lookup
+
+    def get(indicator, window):
+        return cache.get(close, indicator, window, seriesKey=seriesKey)
+
+    # Position = change in Signal, with a 0 on the first bar (as crossoverSignals)
+    signal = np.column_stack([strategy.signal(get, close) for strategy in strategies]).astype(np.int8)
+    position = np.zeros_like(signal)
+    position[1:] = np.diff(signal, axis=0)
+
+    limits = [riskLimits(strategy.stopLoss, strategy.takeProfit) for strategy in strategies]
+    plain = [j for j in range(len(strategies)) if limits[j] is None]
+    risky = [j for j in range(len(strategies)) if limits[j] is not None]
+
+    results = []
+    if plain:
+        _, _, _, trade = runMAStrategyEngine(close, position[:, plain], initialCapital)
+        results.append(evaluateRuns(close, trade, initialCapital, periodsPerYear).set_axis(plain))
+    if risky:
+        stopLoss = [limits[j][0] for j in risky]
+        takeProfit = [limits[j][1] for j in risky]
+        _, trade = runRiskControlKernel(close, position[:, risky], stopLoss, takeProfit, initialCapital)
+        results.append(evaluateRuns(close, trade, initialCapital, periodsPerYear).set_axis(risky))
+
+    results = pd.concat(results).sort_index()
+    results.index = pd.Index([strategy.name for strategy in strategies], name="Strategy")
+
+    return results, cache.stats()
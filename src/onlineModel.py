@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.trainMLModel import classificationMetrics
+
+
+class OnlineModel:
+    """
+    Up/down classifier that learns from new labelled bars only, instead of being refit on the full history.
+
+    Two methods:
+        "sgd": logistic regression trained with SGDClassifier.partial_fit on standardised features
+            (the scaler is updated with partial_fit too). Each update is one pass over the new rows.
+        "forest": an incrementally grown random forest. New rows are buffered, and every
+            `chunkSize` rows a few more trees are fitted on that chunk alone. Only the newest
+            `maxTrees` trees are kept, so the forest follows changing markets and stays the same size.
+
+    Class imbalance is handled online instead of with SMOTE: the model keeps running counts of
+    each class, and every update weights rows by total / (2 * count of their class), so both
+    classes carry the same total weight over everything seen so far.
+    """
+
+    classes = np.array([0, 1])
+
+    def __init__(self, method="sgd", alpha=1e-4, treesPerChunk=10, chunkSize=2000, maxTrees=100, randomState=42):
+        """
+        Args:
+            method (str): "sgd" or "forest".
+            alpha (float): L2 regularisation of the SGD model.
+            treesPerChunk (int): Trees added for every chunk of rows (forest).
+            chunkSize (int): Buffered rows needed before new trees are grown (forest).
+            maxTrees (int): Trees kept, oldest dropped first (forest).
+            randomState (int): For reproducibility.
+        """
+        if method not in ("sgd", "forest"):
+            raise ValueError(f"Unknown online method: {method}")
+
+        self.method = method
+        self.treesPerChunk = treesPerChunk
+        self.chunkSize = chunkSize
+        self.maxTrees = maxTrees
+        self.randomState = randomState
+
+        self.classCounts = np.zeros(len(self.classes), dtype=np.int64)
+        self.rowsSeen = 0
+        self.trainedUntil = None # Index label of the last row learned by updateFromHistory
+
+        # SGD state
+        self.scaler = StandardScaler()
+        self.sgd = SGDClassifier(loss="log_loss", alpha=alpha, random_state=randomState)
+
+        # Forest state: fitted chunk forests (oldest first) and rows waiting for the next chunk
+        self.forests = []
+        self.chunksGrown = 0 # Never decreases, so every chunk forest gets a new seed even after old ones are dropped
+        self.bufferX = []
+        self.bufferY = []
+
+    @property
+    def isFitted(self):
+        return bool(self.forests) if self.method == "forest" else hasattr(self.sgd, "coef_")
+
+    def classWeights(self, y):
+        """
+        Row weights that balance the classes over every row seen so far (including y).
+        """
+        total = self.classCounts.sum()
+        weights = total / (len(self.classes) * np.maximum(self.classCounts, 1))
+        return weights[np.searchsorted(self.classes, y)]
+
+    def update(self, X, y):
+        """
+        Learns from new labelled rows. Takes time proportional to len(X), not to the history seen so far.
+
+        Args:
+            X (pd.DataFrame or np.ndarray): New feature rows (same columns as before).
+            y (pd.Series or np.ndarray): Their labels (0 or 1).
+
+        Returns:
+            OnlineModel: self.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.int64)
+        if len(X) == 0:
+            return self
+
+        self.classCounts += np.bincount(y, minlength=len(self.classes))[:len(self.classes)]
+        self.rowsSeen += len(X)
+
+        if self.method == "sgd":
+            self.scaler.partial_fit(X)
+            self.sgd.partial_fit(self.scaler.transform(X), y, classes=self.classes, sample_weight=self.classWeights(y))
+        else:
+            self.bufferX.append(X)
+            self.bufferY.append(y)
+            if sum(len(chunk) for chunk in self.bufferY) >= self.chunkSize:
+                self.growForest()
+
+        return self
+
+    def growForest(self):
+        """
+        Fits treesPerChunk new trees on the buffered rows and drops the oldest trees over maxTrees.
+        """
+        X = np.concatenate(self.bufferX)
+        y = np.concatenate(self.bufferY)
+        self.bufferX, self.bufferY = [], []
+
+        forest = RandomForestClassifier(
+            n_estimators=self.treesPerChunk, random_state=self.randomState + self.chunksGrown
+        )
+        forest.fit(X, y, sample_weight=self.classWeights(y))
+        self.forests.append(forest)
+        self.chunksGrown += 1
+        self.forests = self.forests[-max(1, self.maxTrees // self.treesPerChunk):]
+
+    def updateFromHistory(self, X, y, lookahead=3):
+        """
+        Learns the rows of a growing feature history that come after the last row learned.
+
+        Meant for scheduled runs: pass the full, date-indexed features and labels (e.g. from
+        buildFeaturesFromStore) and only the new rows are used. The last `lookahead` rows are
+        skipped until their future prices are known, because their labels are not final yet.
+
+        Returns:
+            int: Rows learned.
+        """
+        known = len(X) - lookahead
+        first = 0 if self.trainedUntil is None else int(X.index.searchsorted(self.trainedUntil, side="right"))
+        if known <= first:
+            return 0
+
+        self.update(X.iloc[first:known], y.iloc[first:known])
+        self.trainedUntil = X.index[known - 1]
+        return known - first
+
+    def predictProba(self, X) -> np.ndarray:
+        """
+        Probabilities of Down (0) and Up (1), shape (rows, 2).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if not self.isFitted:
+            raise ValueError("The model has not learned enough rows yet.")
+
+        if self.method == "sgd":
+            return self.sgd.predict_proba(self.scaler.transform(X))
+
+        # Average over every tree kept (a chunk that only saw one class gives that class probability 1)
+        proba = np.zeros((len(X), len(self.classes)))
+        for forest in self.forests:
+            proba[:, np.searchsorted(self.classes, forest.classes_)] += forest.predict_proba(X) * len(forest.estimators_)
+        return proba / sum(len(forest.estimators_) for forest in self.forests)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes[self.predictProba(X).argmax(axis=1)]
+
+    def evaluate(self, X_test, y_test):
+        """
+        Scores the model on held-out rows.
+
+        Returns:
+            metrics (dict): Same metrics as trainAndEvaluateModel.
+            predictions (np.ndarray): Predicted labels.
+        """
+        predictions = self.predict(X_test)
+        return classificationMetrics(np.asarray(y_test), predictions), predictions
+
+
+def trainOnline(X_train, X_test, y_train, y_test, method="sgd", batchSize=1000, **modelOptions):
+    """
+    Online counterpart of trainAndEvaluateModel: feeds the (unbalanced) training rows to an
+    OnlineModel in batches, oldest first, then evaluates it.
+
+    Args:
+        X_train, X_test, y_train, y_test: Chronological split without SMOTE (e.g. from buildFeaturesFromStore).
+        method (str): "sgd" or "forest".
+        batchSize (int): Rows per update.
+        **modelOptions: Passed on to OnlineModel.
+
+    Returns:
+        model: The OnlineModel (keep it and call update() with new bars later)
+        metrics: Dict of accuracy and classification report
+        predictions: Predicted labels for X_test
+    """
+    X_train, y_train = np.asarray(X_train), np.asarray(y_train)
+    model = OnlineModel(method, **modelOptions)
+    for start in range(0, len(X_train), batchSize):
+        model.update(X_train[start:start + batchSize], y_train[start:start + batchSize])
+    if method == "forest" and model.bufferY:
+        model.growForest() # Use the rows left in the buffer too
+
+    metrics, predictions = model.evaluate(X_test, y_test)
+    return model, metrics, predictions
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from src.movingAverageStrategy import movingAverageMatrix, crossoverSignals
+from src.backtestStrategy import runMAStrategyEngine
+from src.backtestWithRisk import runRiskControlKernel, riskLimits
+from src.evaluatePerformance import evaluateRuns
+from src.backtestResult import BacktestResult
+
+
+def windowPairs(shortWindows, longWindows):
+    """
+    Lists every (shortWindow, longWindow) combination where the short window is shorter than the long one.
+
+    Returns:
+        pd.DataFrame: 'ShortWindow' and 'LongWindow' columns, one row per pair.
+    """
+    pairs = [(s, l) for s in shortWindows for l in longWindows if s < l]
+    return pd.DataFrame(pairs, columns=["ShortWindow", "LongWindow"])
+
+
+def sweepMAStrategy(data, shortWindows, longWindows, initialCapital=10000, stopLoss=None, takeProfit=None,
+                    rankBy="Closed Trade Return (%)", maxCells=20_000_000, keepResults=False, equityDtype=np.float32):
+    """
+    Backtests every (shortWindow, longWindow) pair and returns a ranked results table.
+
+    Each distinct window's moving average is computed once with rolling().mean() (see
+    movingAverageMatrix) and shared by every pair that uses it. Signals for a batch of pairs are
+    built as one 2-D array and fed straight into the array backtest engines. The averages are not
+    taken from a cumulative sum: its rounding differs from rolling().mean(), which turns equal
+    averages on flat prices into phantom crossovers, so results would no longer match applyMAStrategy.
+    The input DataFrame is not modified.
+
+    Args:
+        data (pd.DataFrame): Price data with a 'Close' column.
+        shortWindows (list): Short moving average windows to try.
+        longWindows (list): Long moving average windows to try.
+        initialCapital (float): Starting cash for every run.
+        stopLoss (float): If given (or takeProfit is), use the risk-controlled backtest (see riskLimits).
+        takeProfit (float): Take profit for the risk-controlled backtest.
+        rankBy (str): Results column used to rank pairs (highest first).
+        maxCells (int): Upper limit on bars x pairs handled per batch, to bound memory.
+        keepResults (bool): Add a 'Result' column with a compact BacktestResult per pair (equity curve, trades).
+        equityDtype (np.dtype): Storage type of the kept equity curves.
+
+    Returns:
+        pd.DataFrame: One row per window pair with the evaluateRuns metrics, best first.
+    """
+    if "Close" not in data.columns:
+        raise ValueError("DataFrame must contain a 'Close' column.")
+
+    close = data["Close"].to_numpy(dtype=np.float64)
+    pairs = windowPairs(shortWindows, longWindows)
+    if pairs.empty:
+        raise ValueError("No window pairs with shortWindow < longWindow to test.")
+
+    limits = riskLimits(stopLoss, takeProfit)
+    windows = np.unique(pairs.to_numpy())
+    averages = movingAverageMatrix(close, windows) # Computed once and shared by every batch
+
+    shortColumns = np.searchsorted(windows, pairs["ShortWindow"])
+    longColumns = np.searchsorted(windows, pairs["LongWindow"])
+    batchSize = max(1, maxCells // max(len(close), 1))
+
+    results = []
+    for start in range(0, len(pairs), batchSize):
+        batch = slice(start, start + batchSize)
+        signal, position = crossoverSignals(averages[:, shortColumns[batch]], averages[:, longColumns[batch]])
+
+        if limits is None:
+            _, _, total, trade = runMAStrategyEngine(close, position, initialCapital)
+        else:
+            total, trade = runRiskControlKernel(close, position, *limits, initialCapital)
+
+        metrics = evaluateRuns(close, trade, initialCapital)
+        if keepResults:
+            metrics["Result"] = [
+                BacktestResult(
+                    data.index, close, position[:, j], total[:, j], trade[:, j], initialCapital, *(limits or (None, None)),
+                    params={"ShortWindow": int(shortWindow), "LongWindow": int(longWindow)}, equityDtype=equityDtype,
+                )
+                for j, (shortWindow, longWindow) in enumerate(pairs.iloc[batch].itertuples(index=False))
+            ]
+        results.append(metrics)
+
+    results = pd.concat([pairs, pd.concat(results, ignore_index=True)], axis=1)
+    return results.sort_values(rankBy, ascending=False, kind="stable").reset_index(drop=True)
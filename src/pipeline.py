@@ -0,0 +1,271 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+
+import pandas as pd
+
+
+@dataclass
+class Stage:
+    """
+    One step of a Pipeline.
+
+    Args:
+        name (str): Unique stage name, used by later stages to refer to its output.
+        func (Callable): Called as func(*inputOutputs, **params).
+        inputs (tuple): Names of the stages whose outputs are passed in, in order.
+        params (dict): Keyword arguments for func. They are part of the cache key, so they must be JSON-friendly.
+        version (str): Bump to force a rerun when code outside the pipeline's codeDirs that func calls changes.
+        cache (bool): Store the output on disk. Turn off for cheap stages with side effects (e.g. plots).
+    """
+    name: str
+    func: Callable
+    inputs: tuple = ()
+    params: dict = field(default_factory=dict)
+    version: str = "1"
+    cache: bool = True
+
+
+class Pipeline:
+    """
+    Runs stages as a DAG and memoizes each stage's output on disk.
+
+    A stage's cache key is a hash of its code, params, version and the content hashes of its
+    inputs, plus a hash of every source file under codeDirs (the src/ package by default), so
+    editing a module a stage calls (not just the stage function itself) invalidates its output.
+    Changing one parameter only reruns that stage and the stages below it, and a rerun that
+    produces the same output as before still lets later stages hit the cache.
+    Cached outputs are only read from disk when a stage that reruns needs them.
+    """
+
+    def __init__(self, cacheDir="cache/pipeline/", profileMemory=True, codeDirs=None):
+        """
+        Args:
+            cacheDir (str): Folder for cached outputs (one .pkl and one .json file per stage run).
+            profileMemory (bool): Track peak memory per stage with tracemalloc (slows pure-Python stages a little).
+            codeDirs (list): Folders whose .py files are part of every cache key (defaults to the src/ package).
+        """
+        self.cacheDir = cacheDir
+        self.profileMemory = profileMemory
+        self.codeDirs = codeDirs or [os.path.dirname(os.path.abspath(__file__))]
+        self.codeHash = None
+        self.stages = {}
+        self.report = pd.DataFrame()
+
+    def addStage(self, name, func, inputs=(), params=None, version="1", cache=True):
+        for inputName in inputs:
+            if inputName not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{inputName}'.")
+        self.stages[name] = Stage(name, func, tuple(inputs), params or {}, version, cache)
+        return self
+
+    def setParams(self, name, **params):
+        """
+        Updates parameters of an existing stage (e.g. pipeline.setParams("backtest", stopLoss=0.05)).
+        """
+        self.stages[name].params.update(params)
+        return self
+
+    def order(self, targets=None):
+        """
+        Returns the stage names needed for targets (all stages by default), dependencies first.
+        """
+        ordered, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            for inputName in self.stages[name].inputs:
+                visit(inputName)
+            ordered.append(name)
+
+        for name in targets or self.stages:
+            visit(name)
+        return ordered
+
+    def sourceHash(self):
+        """
+        Hash of every .py file under codeDirs (paths and contents).
+        """
+        digest = hashlib.sha256()
+        for codeDir in self.codeDirs:
+            for folder, subfolders, files in os.walk(codeDir):
+                subfolders[:] = sorted(d for d in subfolders if d != "__pycache__")
+                for fileName in sorted(f for f in files if f.endswith(".py")):
+                    path = os.path.join(folder, fileName)
+                    digest.update(os.path.relpath(path, codeDir).encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+        return digest.hexdigest()
+
+    def cacheKey(self, stage, inputHashes):
+        try:
+            code = inspect.getsource(stage.func)
+        except (OSError, TypeError):
+            code = f"{stage.func.__module__}:{stage.func.__qualname__}"
+
+        spec = json.dumps({
+            "name": stage.name, "version": stage.version, "code": code, "sources": self.codeHash,
+            "params": stage.params, "inputs": inputHashes,
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(spec.encode()).hexdigest()[:24]
+
+    def cachePaths(self, stage, key):
+        base = os.path.join(self.cacheDir, f"{stage.name}-{key}")
+        return f"{base}.pkl", f"{base}.json"
+
+    def run(self, targets=None):
+        """
+        Runs the stages needed for targets, reusing cached outputs where the key still matches.
+
+        Args:
+            targets (list): Stage names to produce (all stages by default).
+
+        Returns:
+            dict: Stage name -> output, for every target.
+        """
+        self.codeHash = self.sourceHash() # Read once per run, so edits between runs are picked up
+        outputs = {}       # name -> output value already in memory
+        contentHashes = {} # name -> hash of the output's content
+        cachedPaths = {}   # name -> .pkl path, for cache hits that have not been read yet
+        rows = []
+
+        def load(name):
+            if name not in outputs:
+                with open(cachedPaths[name], "rb") as f:
+                    outputs[name] = pickle.load(f)
+            return outputs[name]
+
+        for name in self.order(targets):
+            stage = self.stages[name]
+            key = self.cacheKey(stage, [contentHashes[inputName] for inputName in stage.inputs])
+            outputPath, metaPath = self.cachePaths(stage, key)
+
+            if stage.cache and os.path.exists(outputPath) and os.path.exists(metaPath):
+                with open(metaPath) as f:
+                    contentHashes[name] = json.load(f)["contentHash"]
+                cachedPaths[name] = outputPath
+                rows.append({"Stage": name, "Status": "hit", "Wall Time (s)": 0.0, "Peak Memory (MB)": 0.0, "Key": key})
+                continue
+
+            # Read cached inputs from disk only now that they are needed
+            args = [load(inputName) for inputName in stage.inputs]
+
+            if self.profileMemory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            output = stage.func(*args, **stage.params)
+            wallTime = time.perf_counter() - start
+            peakMemory = 0.0
+            if self.profileMemory:
+                peakMemory = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+                tracemalloc.stop()
+
+            payload = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+            contentHashes[name] = hashlib.sha256(payload).hexdigest()
+            outputs[name] = output
+
+            if stage.cache:
+                # Write to temp files and swap them in, so an interrupted run never leaves a half-written entry
+                os.makedirs(self.cacheDir, exist_ok=True)
+                for path, data, mode in [(outputPath, payload, "wb"), (metaPath, json.dumps({"contentHash": contentHashes[name]}), "w")]:
+                    tempPath = f"{path}.{os.getpid()}.tmp"
+                    with open(tempPath, mode) as f:
+                        f.write(data)
+                    os.replace(tempPath, path)
+
+            rows.append({
+                "Stage": name, "Status": "miss" if stage.cache else "run",
+                "Wall Time (s)": round(wallTime, 4), "Peak Memory (MB)": round(peakMemory, 2), "Key": key,
+            })
+
+        self.report = pd.DataFrame(rows).set_index("Stage")
+        return {name: load(name) for name in targets or self.stages}
+
+
+def loadStage(symbol, start, end, saveTo="data/"):
+    from src.dataLoader import downloadPriceData
+    return downloadPriceData(symbol, start=start, end=end, saveTo=saveTo)
+
+
+def signalsStage(data, shortWindow=10, longWindow=50):
+    from src.movingAverageStrategy import applyMAStrategy
+    return applyMAStrategy(data.copy(), shortWindow, longWindow) # Copy: applyMAStrategy adds columns in place
+
+
+def plotSignalsStage(signals, symbol="BTC-USD", saveTo="images/"):
+    from src.plotSignals import plotSignals
+    plotSignals(signals, symbol=symbol, saveTo=saveTo)
+
+
+def backtestStage(signals, initialCapital=10000, stopLoss=None, takeProfit=None):
+    from src.backtestWithRisk import riskLimits
+
+    # No stop loss / take profit -> plain crossover backtest
+    limits = riskLimits(stopLoss, takeProfit)
+    if limits is None:
+        from src.backtestStrategy import backtestMAStrategy
+        return backtestMAStrategy(signals, initialCapital)
+
+    from src.backtestWithRisk import backtestWithRiskControl
+    return backtestWithRiskControl(signals, initialCapital, *limits)
+
+
+def plotBacktestStage(backtested, saveTo="images/"):
+    from src.plotBacktest import plotBacktestStrategy
+    plotBacktestStrategy(backtested, saveTo=saveTo)
+
+
+def performanceStage(backtested, initialCapital=10000):
+    from src.evaluatePerformance import evaluatePerformance
+    return evaluatePerformance(backtested, initialCapital)
+
+
+def datasetStage(signals, lookahead=3):
+    from src.createMLDataset import createMLDataset
+    return createMLDataset(signals, lookahead=lookahead)
+
+
+def trainStage(dataset):
+    from src.trainMLModel import trainAndEvaluateModel
+    return trainAndEvaluateModel(*dataset)
+
+
+def plotConfusionStage(dataset, trained, saveTo="images/"):
+    from src.trainMLModel import plotConfusionMatrix
+    plotConfusionMatrix(dataset[3], trained[2], saveTo=saveTo)
+
+
+def buildStrategyPipeline(symbol="BTC-USD", start="2018-01-01", end="2025-04-01", shortWindow=10, longWindow=50,
+                          stopLoss=0.1, takeProfit=0.2, initialCapital=10000, lookahead=3, plots=True,
+                          cacheDir="cache/pipeline/"):
+    """
+    Builds the main.py workflow as a Pipeline:
+
+        data -> signals -> backtest -> performance
+                        -> dataset  -> model
+
+    Plot stages (plotSignals, plotBacktest, plotConfusion) are added when plots=True and are never cached.
+    Pass stopLoss=None and takeProfit=None for the plain crossover backtest.
+    """
+    pipeline = Pipeline(cacheDir)
+    pipeline.addStage("data", loadStage, params={"symbol": symbol, "start": start, "end": end})
+    pipeline.addStage("signals", signalsStage, ["data"], {"shortWindow": shortWindow, "longWindow": longWindow})
+    pipeline.addStage("backtest", backtestStage, ["signals"], {"initialCapital": initialCapital, "stopLoss": stopLoss, "takeProfit": takeProfit})
+    pipeline.addStage("performance", performanceStage, ["backtest"], {"initialCapital": initialCapital})
+    pipeline.addStage("dataset", datasetStage, ["signals"], {"lookahead": lookahead})
+    pipeline.addStage("model", trainStage, ["dataset"])
+
+    if plots:
+        pipeline.addStage("plotSignals", plotSignalsStage, ["signals"], {"symbol": symbol}, cache=False)
+        pipeline.addStage("plotBacktest", plotBacktestStage, ["backtest"], cache=False)
+        pipeline.addStage("plotConfusion", plotConfusionStage, ["dataset", "model"], cache=False)
+
+    return pipeline
@@ -1,7 +1,10 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 
-def plotBacktestStrategy(data, saveTo="images/"):
+from src.downsample import downsampleIndices
+
+def plotBacktestStrategy(data, saveTo="images/", maxPoints=5000, method="minmax"):
 
     """
     Plot the portfolio's total value (equity curve) over time.
@@ -9,6 +12,11 @@ def plotBacktestStrategy(data, saveTo="images/"):
     Args:
         data (pd.DataFrame): DataFrame that contains a 'Total' column, representing portfolio value at each time step.
         saveTo (str): Folder path to save the output chart. Defaults to "images/".
+        maxPoints (int): Curves longer than this are downsampled before plotting (None = plot every point).
+        method (str): Downsampling method, "minmax" or "lttb" (see downsample.py).
+
+    Returns:
+        str: Path of the saved image.
     """
     
     
@@ -18,7 +26,10 @@ def plotBacktestStrategy(data, saveTo="images/"):
     # Set the figure size
     plt.figure(figsize=(16, 8))
 
-    plt.plot(data.index, data["Total"], label="Portfolio Value", linewidth=2)
+    # Downsample long curves to at most maxPoints points
+    rows = downsampleIndices(np.arange(len(data)), data["Total"].to_numpy(), maxPoints, method)
+
+    plt.plot(data.index[rows], data["Total"].iloc[rows], label="Portfolio Value", linewidth=2)
     plt.title("Portfolio Equity Curve Over Time")
     plt.xlabel("Date")
     plt.ylabel("Portfolio Value ($)")
@@ -30,4 +41,5 @@ def plotBacktestStrategy(data, saveTo="images/"):
     plt.tight_layout()
     plt.savefig(imagePath)
     print(f"Portfolio equity curve saved to: {imagePath}")
-    plt.close()
\ No newline at end of file
+    plt.close()
+    return imagePath
\ No newline at end of file
@@ -1,7 +1,10 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 
-def plotSignals(data, symbol="BTC-USD", saveTo="images/"):
+from src.downsample import downsampleIndices
+
+def plotSignals(data, symbol="BTC-USD", saveTo="images/", maxPoints=5000, method="minmax"):
     """
     Plot closing price, moving averages, and buy/sell signals.
 
@@ -9,6 +12,11 @@ def plotSignals(data, symbol="BTC-USD", saveTo="images/"):
         data (pd.DataFrame): DataFrame containing 'Close', 'ShortMA', 'LongMA', 'Signal', and 'Position' columns.
         symbol (str): Ticker symbol used in the plot title and filename.
         saveTo (str): Directory to save the image file.
+        maxPoints (int): Lines longer than this are downsampled before plotting (None = plot every point).
+        method (str): Downsampling method, "minmax" or "lttb" (see downsample.py).
+
+    Returns:
+        str: Path of the saved image.
     """
 
     # Create the images/ folder if it doesn't exist
@@ -18,10 +26,12 @@ def plotSignals(data, symbol="BTC-USD", saveTo="images/"):
     plt.figure(figsize=(16, 8))
 
 
-    # Plot the main price and moving averages
-    plt.plot(data.index, data['Close'], label='Closing Price', linewidth=1.5)
-    plt.plot(data.index, data['ShortMA'], label='Short Moving Average', linestyle="--")
-    plt.plot(data.index, data['LongMA'], label='Long Moving Average', linestyle="--")
+    # Plot the main price and moving averages (downsampled for long histories, so each line has at most maxPoints points)
+    # The buy/sell markers below are drawn at their actual prices; with minmax they stay inside the range drawn for their bucket
+    x = np.arange(len(data))
+    for column, label, style in [('Close', 'Closing Price', '-'), ('ShortMA', 'Short Moving Average', '--'), ('LongMA', 'Long Moving Average', '--')]:
+        rows = downsampleIndices(x, data[column].to_numpy(), maxPoints, method)
+        plt.plot(data.index[rows], data[column].iloc[rows], label=label, linestyle=style, linewidth=1.5 if column == 'Close' else None)
 
 
     # Plot buy signals (where Position == 1 or 2) 
@@ -45,3 +55,4 @@ def plotSignals(data, symbol="BTC-USD", saveTo="images/"):
     plt.savefig(imagePath)
     print(f"Plot saved to: {imagePath}")
     plt.close()
+    return imagePath
@@ -0,0 +1,144 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.movingAverageStrategy import movingAverageMatrix, crossoverSignals
+from src.backtestWithRisk import runRiskControlKernel
+from src.evaluatePerformance import evaluateRuns, equityCurve
+
+
+# Shared memory blocks attached once per worker process (name -> (SharedMemory, array view))
+sharedArrays = {}
+
+
+def attachSharedArrays(blocks):
+    """
+    Worker initializer: attaches the shared price/output blocks once, so tasks only carry offsets.
+
+    Args:
+        blocks (dict): Key -> (shared memory name, length, dtype string).
+    """
+    for key, (name, length, dtype) in blocks.items():
+        block = shared_memory.SharedMemory(name=name)
+        sharedArrays[key] = (block, np.ndarray((length,), dtype=dtype, buffer=block.buf))
+
+
+def backtestSymbolBatch(tasks, settings):
+    """
+    Runs the MA crossover + risk-controlled backtest for a batch of symbols inside a worker.
+
+    Prices are read from (and equity curves written to) shared memory, so only the
+    offsets in and the small metrics dicts out are pickled.
+
+    Args:
+        tasks (list): (symbol, startOffset, endOffset) for each symbol.
+        settings (dict): shortWindow, longWindow, stopLoss, takeProfit and capital.
+
+    Returns:
+        list: (symbol, metrics dict) for each symbol.
+    """
+    prices = sharedArrays["Close"][1]
+    equities = sharedArrays["Equity"][1]
+
+    results = []
+    for symbol, start, end in tasks:
+        close = prices[start:end]
+
+        averages = movingAverageMatrix(close, [settings["shortWindow"], settings["longWindow"]])
+        _, position = crossoverSignals(averages[:, 0], averages[:, 1])
+        _, trade = runRiskControlKernel(
+            close, position, settings["stopLoss"], settings["takeProfit"], settings["capital"]
+        )
+
+        equities[start:end] = equityCurve(close, trade[:, 0], settings["capital"]) # Compounded account value, not Total
+        metrics = evaluateRuns(close, trade, settings["capital"]).to_dict("records")[0]
+        results.append((symbol, metrics))
+
+    return results
+
+
+def runPortfolioBacktest(prices, shortWindow=10, longWindow=50, stopLoss=0.1, takeProfit=0.2,
+                         initialCapital=10000, workers=None, batchesPerWorker=4):
+    """
+    Backtests many symbols in parallel and combines them into one equal-weight portfolio.
+
+    All closing prices are packed into one shared memory block that every worker process
+    reads directly instead of receiving pickled copies. Symbols are handed out in batches
+    so each task is big enough to keep the pool busy.
+
+    On Windows (spawn start method) this must be called from under `if __name__ == "__main__":`.
+
+    Args:
+        prices (dict): Symbol -> DataFrame with a 'Close' column (e.g. from downloadPriceData).
+        shortWindow (int): Short moving average window.
+        longWindow (int): Long moving average window.
+        stopLoss (float): Stop loss for every symbol (e.g. 0.1 = 10%).
+        takeProfit (float): Take profit for every symbol (e.g. 0.2 = 20%).
+        initialCapital (float): Total starting cash, split equally between symbols.
+        workers (int): Number of worker processes (defaults to the CPU count).
+        batchesPerWorker (int): How many batches of symbols to create per worker.
+
+    Returns:
+        portfolio (pd.Series): Combined portfolio value over the union of all symbols' dates
+            (sum of every symbol's compounded equity curve, see evaluatePerformance.equityCurve).
+        metrics (pd.DataFrame): One row of performance metrics per symbol.
+    """
+    symbols = list(prices)
+    if not symbols:
+        raise ValueError("No symbols to backtest.")
+
+    workers = workers or os.cpu_count() or 1
+    capital = initialCapital / len(symbols)
+    lengths = np.array([len(prices[symbol]) for symbol in symbols])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    numBars = int(offsets[-1])
+
+    # One contiguous block for all closes, plus an output block for the equity curves
+    blocks = {}
+    sharedBlocks = []
+    closeArray = equityArray = None
+    try:
+        for key, dtype in [("Close", "float64"), ("Equity", "float64")]:
+            block = shared_memory.SharedMemory(create=True, size=max(numBars * np.dtype(dtype).itemsize, 1))
+            sharedBlocks.append(block)
+            blocks[key] = (block.name, numBars, dtype)
+
+        closeArray = np.ndarray((numBars,), dtype="float64", buffer=sharedBlocks[0].buf)
+        for symbol, start, end in zip(symbols, offsets[:-1], offsets[1:]):
+            closeArray[start:end] = prices[symbol]["Close"].to_numpy(dtype=np.float64)
+
+        tasks = [(symbol, int(start), int(end)) for symbol, start, end in zip(symbols, offsets[:-1], offsets[1:])]
+        batchSize = max(1, -(-len(tasks) // (workers * batchesPerWorker)))
+        batches = [tasks[i:i + batchSize] for i in range(0, len(tasks), batchSize)]
+        settings = {
+            "shortWindow": shortWindow, "longWindow": longWindow,
+            "stopLoss": stopLoss, "takeProfit": takeProfit, "capital": capital,
+        }
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=attachSharedArrays, initargs=(blocks,)) as pool:
+            batchResults = list(pool.map(backtestSymbolBatch, batches, [settings] * len(batches)))
+
+        equityArray = np.ndarray((numBars,), dtype="float64", buffer=sharedBlocks[1].buf)
+        curves = {
+            symbol: pd.Series(equityArray[start:end].copy(), index=prices[symbol].index)
+            for symbol, start, end in tasks
+        }
+    finally:
+        closeArray = equityArray = None # Release the views before the blocks are closed
+        for block in sharedBlocks:
+            block.close()
+            block.unlink()
+
+    metrics = pd.DataFrame.from_dict(
+        {symbol: result for batch in batchResults for symbol, result in batch}, orient="index"
+    ).reindex(symbols)
+    metrics.index.name = "Symbol"
+
+    # Align every symbol on the union of dates: carry the last value forward, starting capital before the first bar
+    equity = pd.concat(curves, axis=1).sort_index().ffill().fillna(capital)
+    portfolio = equity.sum(axis=1).rename("Equity")
+
+    return portfolio, metrics
@@ -0,0 +1,163 @@
+import os
+import random
+import threading
+import time
+
+import pandas as pd
+
+
+class ProviderError(Exception):
+    """
+    A fetch that failed but may succeed if retried (timeouts, rate limits, server errors).
+    """
+
+
+class SymbolNotFoundError(ProviderError):
+    """
+    The provider does not know some of the requested symbols. Not worth retrying.
+    """
+
+    def __init__(self, symbols, message=None):
+        self.symbols = list(symbols) # The unknown symbols
+        super().__init__(message or f"Symbol not found: {', '.join(self.symbols)}")
+
+
+class PriceProvider:
+    """
+    Interface for price data sources used by the downloader.
+
+    Subclasses implement fetch(). maxBatchSize says how many symbols one request may ask for.
+    """
+
+    maxBatchSize = 1
+
+    def fetch(self, symbols, start, end) -> dict:
+        """
+        Fetches daily bars for several symbols over one date range.
+
+        Args:
+            symbols (list): Symbols to fetch (at most maxBatchSize).
+            start (str): Start date, 'YYYY-MM-DD'.
+            end (str): End date, 'YYYY-MM-DD' (exclusive).
+
+        Returns:
+            dict: symbol -> DataFrame indexed by date, like downloadPriceData, for every requested
+            symbol. A symbol without bars in the range (weekend, holiday, before listing) gets an
+            empty DataFrame, so the range can still be marked as covered.
+
+        Raises:
+            SymbolNotFoundError: Some of the symbols are unknown to the provider.
+            ProviderError: The request failed and may succeed if retried.
+        """
+        raise NotImplementedError
+
+
+class YahooProvider(PriceProvider):
+    """
+    Yahoo Finance through yfinance, several symbols per request.
+
+    yf.download does not raise on network errors or throttling: it logs them and returns empty
+    or all-NaN columns. A symbol without rows is therefore classified from the error yfinance
+    recorded for it: "no price data found" means Yahoo answered with no bars for the range, "no
+    timezone found" (or not found / delisted) means the symbol is unknown, and anything else,
+    or no recorded error at all, is treated as a failed request.
+    """
+
+    def __init__(self, maxBatchSize=20):
+        self.maxBatchSize = maxBatchSize
+
+    def fetch(self, symbols, start, end) -> dict:
+        import yfinance as yf # Imported here so loading from the local store doesn't pay for it
+
+        try:
+            df = yf.download(list(symbols), start=start, end=end, auto_adjust=False, group_by="ticker", progress=False)
+        except Exception as e:
+            raise ProviderError(str(e)) from e
+
+        # Per-symbol errors from the last download (symbol -> message), kept by yfinance in shared._ERRORS
+        errors = getattr(getattr(yf, "shared", None), "_ERRORS", None) or {}
+
+        results, notFound, failed = {}, [], {}
+        for symbol in symbols:
+            if not isinstance(df.columns, pd.MultiIndex):
+                frame = df
+            elif symbol in df.columns.get_level_values(0):
+                frame = df[symbol]
+            else:
+                frame = pd.DataFrame()
+            frame = frame.dropna(how="all")
+            if not frame.empty:
+                results[symbol] = frame
+                continue
+
+            error = str(errors.get(symbol, errors.get(symbol.upper(), "no data returned")))
+            if "no price data found" in error.lower() or "no data found" in error.lower():
+                results[symbol] = frame # Answered, just no bars in this range
+            elif any(reason in error.lower() for reason in ("no timezone found", "not found", "delisted")):
+                notFound.append(symbol)
+            else:
+                failed[symbol] = error
+
+        if failed:
+            raise ProviderError("; ".join(f"{symbol}: {error}" for symbol, error in failed.items()))
+        if notFound:
+            raise SymbolNotFoundError(notFound)
+        return results
+
+
+class LocalFileProvider(PriceProvider):
+    """
+    Offline stand-in for a real provider, serving prices from CSV files ({folder}/{symbol}.csv).
+
+    Simulated latency and random failures make it possible to test throughput, rate limiting
+    and retries without a network.
+    """
+
+    def __init__(self, folder, latency=0.0, failureRate=0.0, maxBatchSize=20, seed=None):
+        """
+        Args:
+            folder (str): Folder with one CSV per symbol (see writeProviderFiles).
+            latency (float): Seconds every request takes.
+            failureRate (float): Probability that a request fails with a ProviderError.
+            maxBatchSize (int): Symbols allowed per request.
+            seed (int): Seed for the simulated failures.
+        """
+        self.folder = folder
+        self.latency = latency
+        self.failureRate = failureRate
+        self.maxBatchSize = maxBatchSize
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0 # Requests served (including failed ones)
+
+    def fetch(self, symbols, start, end) -> dict:
+        with self.lock:
+            self.requests += 1
+            fail = self.random.random() < self.failureRate
+        time.sleep(self.latency)
+        if fail:
+            raise ProviderError("Simulated provider failure")
+
+        results, notFound = {}, []
+        for symbol in symbols:
+            path = os.path.join(self.folder, f"{symbol}.csv")
+            if not os.path.exists(path):
+                notFound.append(symbol)
+                continue
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            results[symbol] = df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))] # May be empty
+
+        if notFound:
+            raise SymbolNotFoundError(notFound)
+        return results
+
+
+def writeProviderFiles(folder, symbols, numBars=2000, start="2018-01-01"):
+    """
+    Writes synthetic daily prices for every symbol as LocalFileProvider CSV files.
+    """
+    from src.syntheticData import generateSyntheticPrices
+
+    os.makedirs(folder, exist_ok=True)
+    for seed, symbol in enumerate(symbols):
+        generateSyntheticPrices(numBars, seed=seed, start=start).to_csv(os.path.join(folder, f"{symbol}.csv"))
@@ -0,0 +1,249 @@
+import math
+
+import numpy as np
+
+
+class RollingMean:
+    """
+    Moving average over the last `window` values, updated in constant time per value.
+
+    Keeps a ring buffer of the values in the window and a running sum. The running sum uses the
+    same compensated add/remove steps as pandas' rolling().mean(), so the averages match
+    applyMAStrategy bar for bar instead of slowly drifting away from it.
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        self.window = window
+        self.buffer = [math.nan] * window # Ring buffer of the last `window` values
+        self.head = 0 # Slot the next value is written to
+        self.count = 0 # Values seen so far
+
+        self.nobs = 0 # Non-missing values currently in the window
+        self.sumX = 0.0
+        self.compensationAdd = 0.0
+        self.compensationRemove = 0.0
+        self.negCount = 0
+        self.sameCount = 0 # How many of the latest values were identical (avoids rounding noise on flat prices)
+        self.prevValue = math.nan
+
+    def reset(self, value):
+        self.nobs = 0
+        self.sumX = 0.0
+        self.compensationAdd = 0.0
+        self.compensationRemove = 0.0
+        self.negCount = 0
+        self.sameCount = 0
+        self.prevValue = value
+
+    def add(self, value):
+        if value == value: # Skip missing (NaN) values
+            self.nobs += 1
+            y = value - self.compensationAdd
+            t = self.sumX + y
+            self.compensationAdd = t - self.sumX - y
+            self.sumX = t
+            if math.copysign(1.0, value) < 0:
+                self.negCount += 1
+
+            if value == self.prevValue:
+                self.sameCount += 1
+            else:
+                self.sameCount = 1
+            self.prevValue = value
+
+    def remove(self, value):
+        if value == value:
+            self.nobs -= 1
+            y = -value - self.compensationRemove
+            t = self.sumX + y
+            self.compensationRemove = t - self.sumX - y
+            self.sumX = t
+            if math.copysign(1.0, value) < 0:
+                self.negCount -= 1
+
+    def update(self, value) -> float:
+        """
+        Adds one value and returns the current average (NaN until the window is full).
+        """
+        value = float(value)
+
+        if self.count == 0 or self.window == 1:
+            self.reset(value) # pandas starts a fresh sum when the window no longer overlaps the last one
+        elif self.count >= self.window:
+            self.remove(self.buffer[self.head]) # Oldest value drops out of the window
+        self.add(value)
+
+        self.buffer[self.head] = value
+        self.head = (self.head + 1) % self.window
+        self.count += 1
+
+        if self.nobs < self.window:
+            return math.nan
+
+        mean = self.sumX / self.nobs
+        if self.sameCount >= self.nobs:
+            mean = self.prevValue
+        elif self.negCount == 0 and mean < 0:
+            mean = 0.0
+        elif self.negCount == self.nobs and mean > 0:
+            mean = 0.0
+        return mean
+
+    def updateBlock(self, values) -> np.ndarray:
+        """
+        Adds a block of values and returns the average after each one.
+
+        Same arithmetic as calling update() per value, with the state kept in local
+        variables for the whole block (several times faster on long blocks).
+        """
+        values = np.asarray(values, dtype=np.float64).tolist()
+        out = [math.nan] * len(values)
+        window, buffer, head, count = self.window, self.buffer, self.head, self.count
+        nobs, sumX, compAdd, compRemove = self.nobs, self.sumX, self.compensationAdd, self.compensationRemove
+        negCount, sameCount, prevValue = self.negCount, self.sameCount, self.prevValue
+        copysign, nan = math.copysign, math.nan
+
+        for i, value in enumerate(values):
+            if count == 0 or window == 1:
+                nobs, sumX, compAdd, compRemove, negCount, sameCount, prevValue = 0, 0.0, 0.0, 0.0, 0, 0, value
+            elif count >= window:
+                old = buffer[head]
+                if old == old:
+                    nobs -= 1
+                    y = -old - compRemove
+                    t = sumX + y
+                    compRemove = t - sumX - y
+                    sumX = t
+                    if copysign(1.0, old) < 0:
+                        negCount -= 1
+
+            if value == value:
+                nobs += 1
+                y = value - compAdd
+                t = sumX + y
+                compAdd = t - sumX - y
+                sumX = t
+                if copysign(1.0, value) < 0:
+                    negCount += 1
+                if value == prevValue:
+                    sameCount += 1
+                else:
+                    sameCount = 1
+                prevValue = value
+
+            buffer[head] = value
+            head += 1
+            if head == window:
+                head = 0
+            count += 1
+
+            if nobs < window:
+                out[i] = nan
+                continue
+            mean = sumX / nobs
+            if sameCount >= nobs:
+                mean = prevValue
+            elif negCount == 0 and mean < 0:
+                mean = 0.0
+            elif negCount == nobs and mean > 0:
+                mean = 0.0
+            out[i] = mean
+
+        self.head, self.count = head, count
+        self.nobs, self.sumX, self.compensationAdd, self.compensationRemove = nobs, sumX, compAdd, compRemove
+        self.negCount, self.sameCount, self.prevValue = negCount, sameCount, prevValue
+        return np.array(out, dtype=np.float64)
+
+
+class StreamingMAStrategy:
+    """
+    Incremental Moving Average Crossover strategy for live bar feeds.
+
+    Each new bar updates the short and long moving averages, Signal and Position, and the
+    stop loss / take profit portfolio in constant time and memory, giving the same values as
+    applyMAStrategy followed by backtestWithRiskControl on the full history.
+    """
+
+    def __init__(self, shortWindow=10, longWindow=50, initialCapital=10000, stopLoss=0.1, takeProfit=0.2):
+        self.shortMA = RollingMean(shortWindow)
+        self.longMA = RollingMean(longWindow)
+        self.initialCapital = initialCapital
+        self.stopLoss = stopLoss
+        self.takeProfit = takeProfit
+
+        self.prevSignal = None # None until the first bar (Position is NaN on the first row)
+        self.inPosition = False
+        self.entryPrice = 0.0
+
+    def update(self, close) -> dict:
+        """
+        Processes one bar.
+
+        Args:
+            close (float): The bar's closing price.
+
+        Returns:
+            dict: 'Close', 'ShortMA', 'LongMA', 'Signal', 'Position', 'Holdings', 'Cash', 'Total' and 'Trade' for this bar.
+        """
+        close = float(close)
+        shortMA = self.shortMA.update(close)
+        longMA = self.longMA.update(close)
+
+        # Signal: 1 when the short MA is above the long MA, -1 when below, otherwise 0
+        signal = 1 if shortMA > longMA else -1 if shortMA < longMA else 0
+        position = math.nan if self.prevSignal is None else float(signal - self.prevSignal)
+        self.prevSignal = signal
+
+        holdings, cash, total, trade = self.updatePortfolio(close, position)
+
+        return {
+            "Close": close, "ShortMA": shortMA, "LongMA": longMA, "Signal": signal, "Position": position,
+            "Holdings": holdings, "Cash": cash, "Total": total, "Trade": trade,
+        }
+
+    def updateMany(self, closes) -> list:
+        """
+        Processes a micro-batch of bars in order.
+
+        Args:
+            closes (iterable): Closing prices.
+
+        Returns:
+            list: One update dict per bar.
+        """
+        return [self.update(close) for close in closes]
+
+    def updatePortfolio(self, currentPrice, position):
+        """
+        Stop loss / take profit portfolio step, same rules as backtestWithRiskControl.
+
+        Returns:
+            tuple: (holdings, cash, total, trade) for this bar.
+        """
+        capital = self.initialCapital
+        if position != position:
+            position = 0.0 # Missing Position counts as no signal
+
+        # BUY Condition: If a buy signal appears and no active position exists
+        if position > 0 and not self.inPosition:
+            self.entryPrice = currentPrice
+            self.inPosition = True
+            return float(capital), 0.0, 0.0 + capital, 1.0
+
+        if not self.inPosition:
+            return 0.0, float(capital), capital + 0.0, 0.0
+
+        # In a trade, check for stop loss or take profit conditions
+        currentValue = (capital / self.entryPrice) * currentPrice
+        if currentPrice <= self.entryPrice * (1 - self.stopLoss) or currentPrice >= self.entryPrice * (1 + self.takeProfit):
+            self.inPosition = False
+            return 0.0, currentValue, float(capital), -1.0 # Total is left at initialCapital on these rows, as in the batch version
+
+        # Signal based sell condition
+        if position < 0:
+            self.inPosition = False
+            return 0.0, currentValue, currentValue + 0.0, -1.0
+
+        return currentValue, float(capital), capital + currentValue, 0.0
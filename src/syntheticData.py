@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+
+def generateSyntheticPrices(numBars: int, seed: int = 42, startPrice: float = 100.0, drift: float = 0.0002,
+                            volatility: float = 0.02, start: str = "2000-01-01", freq: str = None) -> pd.DataFrame:
+    """
+    Generates a deterministic OHLCV price history using geometric Brownian motion.
+
+    Useful for timing and testing the pipeline offline, without calling Yahoo Finance.
+    The same seed always produces the same data.
+
+    Args:
+        numBars (int): Number of bars to generate.
+        seed (int): Random seed.
+        startPrice (float): Price of the first bar.
+        drift (float): Average log return per bar.
+        volatility (float): Standard deviation of log returns per bar.
+        start (str): Timestamp of the first bar.
+        freq (str): Bar frequency. Defaults to daily, or minute bars above 50,000 bars (daily dates run out after a few centuries).
+
+    Returns:
+        pd.DataFrame: 'Open', 'High', 'Low', 'Close', 'Adj Close' and 'Volume' columns indexed by date, like downloadPriceData.
+    """
+    rng = np.random.default_rng(seed)
+    freq = freq or ("D" if numBars <= 50_000 else "min")
+
+    # Geometric Brownian motion: log returns are normally distributed
+    logReturns = (drift - 0.5 * volatility ** 2) + volatility * rng.standard_normal(numBars)
+    close = startPrice * np.exp(np.cumsum(logReturns))
+
+    # Each bar opens at the previous close and trades a little above and below its open/close
+    openPrice = np.concatenate(([startPrice], close[:-1]))
+    high = np.maximum(openPrice, close) * (1 + np.abs(rng.standard_normal(numBars)) * volatility / 2)
+    low = np.minimum(openPrice, close) * (1 - np.abs(rng.standard_normal(numBars)) * volatility / 2)
+    volume = np.round(rng.lognormal(mean=13, sigma=0.5, size=numBars))
+
+    index = pd.date_range(start=start, periods=numBars, freq=freq, name="Date")
+    return pd.DataFrame({
+        "Adj Close": close,
+        "Close": close,
+        "High": high,
+        "Low": low,
+        "Open": openPrice,
+        "Volume": volume,
+    }, index=index)
@@ -1,7 +1,7 @@
+import os
+
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 def trainAndEvaluateModel(X_train, X_test, y_train, y_test):
     """
@@ -16,8 +16,14 @@ def trainAndEvaluateModel(X_train, X_test, y_train, y_test):
 
     predictions = model.predict(X_test)
 
+    return model, classificationMetrics(y_test, predictions), predictions
+
+def classificationMetrics(y_test, predictions):
+    """
+    Accuracy (%) plus precision, recall and F1 for both classes (1 = Up, 0 = Down).
+    """
     accuracy = accuracy_score(y_test, predictions)
-    report = classification_report(y_test, predictions, output_dict=True)
+    report = classification_report(y_test, predictions, labels=[0, 1], target_names=["0", "1"], output_dict=True, zero_division=0)
 
     metrics = {
         "Accuracy": round(accuracy * 100, 2),
@@ -29,12 +35,19 @@ def trainAndEvaluateModel(X_train, X_test, y_train, y_test):
         "F1 (Down)": round(report["0"]["f1-score"], 2),
     }
 
-    return model, metrics, predictions
+    return metrics
 
 def plotConfusionMatrix(y_true, y_pred, saveTo="images/"):
     """
     Plots and saves a confusion matrix for ML classification results.
     """
+    # Plotting libraries are only loaded when a plot is drawn, not for every training run
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Create the images/ folder if it doesn't exist
+    os.makedirs(saveTo, exist_ok=True)
+
     cm = confusion_matrix(y_true, y_pred)
     labels = ["Down", "Up"]
 
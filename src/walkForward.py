@@ -0,0 +1,135 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTE
+
+from src.createMLDataset import buildFeaturesFromStore
+from src.featureStore import FeatureStore
+from src.trainMLModel import trainAndEvaluateModel
+
+
+# Feature/label arrays handed to each worker process once (lookahead -> (X, y))
+workerDatasets = {}
+
+
+def setWorkerDatasets(datasets):
+    """
+    Worker initializer: receives the feature/label arrays once per process instead of once per fold.
+    """
+    workerDatasets.update(datasets)
+
+
+def walkForwardFolds(numRows, trainSize, testSize, step=None):
+    """
+    Lists rolling walk-forward windows: train on `trainSize` rows, test on the next `testSize` rows, move on by `step`.
+
+    Returns:
+        list: (trainStart, testStart, testEnd) row positions for each fold.
+    """
+    step = step or testSize
+    return [
+        (start, start + trainSize, start + trainSize + testSize)
+        for start in range(0, numRows - trainSize - testSize + 1, step)
+    ]
+
+
+def trainFold(lookahead, fold, trainStart, testStart, testEnd, randomState):
+    """
+    Trains and evaluates one walk-forward fold inside a worker. SMOTE is applied to this fold's training rows only.
+
+    Returns:
+        dict: Fold details, the trainAndEvaluateModel metrics and wall/CPU time of the fold.
+    """
+    wallStart = time.perf_counter()
+    cpuStart = time.process_time()
+
+    X, y = workerDatasets[lookahead]
+    X_train, y_train = X[trainStart:testStart], y[trainStart:testStart]
+    X_test, y_test = X[testStart:testEnd], y[testStart:testEnd]
+
+    X_train, y_train = SMOTE(random_state=randomState).fit_resample(X_train, y_train)
+    _, metrics, _ = trainAndEvaluateModel(X_train, X_test, y_train, y_test)
+
+    return {
+        "Lookahead": lookahead, "Fold": fold,
+        "Train Start": trainStart, "Test Start": testStart, "Test End": testEnd,
+        **metrics,
+        "Wall Time (s)": time.perf_counter() - wallStart,
+        "CPU Time (s)": time.process_time() - cpuStart,
+    }
+
+
+def runWalkForward(data, lookaheads=(3,), trainSize=500, testSize=100, step=None, featureStore=None,
+                   symbol=None, workers=None, randomState=42):
+    """
+    Walk-forward validation of the ML model over rolling windows and several lookahead horizons,
+    with the folds trained in parallel on a process pool.
+
+    Features come from a FeatureStore (computed once, reused across horizons and later runs)
+    and SMOTE is applied inside each fold, so no synthetic rows leak into test windows.
+
+    On Windows (spawn start method) this must be called from under `if __name__ == "__main__":`.
+
+    Args:
+        data (pd.DataFrame): Price data (must include 'Close' and 'Volume').
+        lookaheads (list): Label horizons (days ahead) to evaluate.
+        trainSize (int): Rows in each training window.
+        testSize (int): Rows in each test window.
+        step (int): Rows to move forward between folds (defaults to testSize).
+        featureStore (FeatureStore): Feature cache to use (a temporary one is created if not given).
+        symbol (str): Key used for this data in the feature store (required when featureStore is given).
+        workers (int): Number of worker processes (defaults to the CPU count).
+        randomState (int): For reproducibility.
+
+    Returns:
+        folds (pd.DataFrame): One row per (lookahead, fold) with its metrics and timings.
+        summary (pd.DataFrame): Mean and standard deviation of every metric per lookahead.
+        timings (dict): Total wall time, summed fold CPU time and the resulting parallel speedup.
+    """
+    wallStart = time.perf_counter()
+    if featureStore is None:
+        featureStore, symbol = FeatureStore(), "temporary"
+    elif symbol is None:
+        raise ValueError("symbol is required when a featureStore is given.")
+    workers = workers or os.cpu_count() or 1
+
+    # Build every horizon's feature/label arrays in the parent, reusing cached features
+    datasets = {}
+    dates = {}
+    tasks = []
+    for lookahead in lookaheads:
+        X, y = buildFeaturesFromStore(data, lookahead, featureStore, symbol)
+        datasets[lookahead] = (X.to_numpy(), y.to_numpy())
+        dates[lookahead] = X.index
+        for fold, (trainStart, testStart, testEnd) in enumerate(walkForwardFolds(len(X), trainSize, testSize, step)):
+            tasks.append((lookahead, fold, trainStart, testStart, testEnd, randomState))
+
+    if not tasks:
+        raise ValueError("Not enough rows for a single walk-forward fold.")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=setWorkerDatasets, initargs=(datasets,)) as pool:
+        results = list(pool.map(trainFold, *zip(*tasks)))
+
+    folds = pd.DataFrame(results)
+
+    # Turn row positions into dates for readability
+    for column in ["Train Start", "Test Start"]:
+        folds[column] = [dates[lookahead][row] for lookahead, row in zip(folds["Lookahead"], folds[column])]
+    folds["Test End"] = [dates[lookahead][row - 1] for lookahead, row in zip(folds["Lookahead"], folds["Test End"])]
+
+    metricColumns = [column for column in folds.columns if column not in ["Lookahead", "Fold", "Train Start", "Test Start", "Test End"]]
+    summary = folds.groupby("Lookahead")[metricColumns].agg(["mean", "std"])
+    summary.insert(0, ("Folds", "count"), folds.groupby("Lookahead").size())
+
+    wallTime = time.perf_counter() - wallStart
+    cpuTime = float(folds["CPU Time (s)"].sum())
+    timings = {
+        "Wall Time (s)": round(wallTime, 3),
+        "Fold CPU Time (s)": round(cpuTime, 3),
+        "Speedup": round(cpuTime / wallTime, 2) if wallTime > 0 else np.nan,
+    }
+
+    return folds, summary, timings